@@ -0,0 +1 @@
+"""Offline benchmarks for PT Baby Swing."""
@@ -0,0 +1,446 @@
+"""Benchmark the coordinator command path against a fake BLE client.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_coordinator --output bench.json
+
+Every scenario drives a real ``PTBabyCoordinator`` inside a throwaway
+Home Assistant instance; only the radio is faked (see ``fake_client``).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import bleak_retry_connector
+from bleak.backends.device import BLEDevice
+from habluetooth.usage import HaBleakClientWithServiceCache
+from habluetooth.central_manager import CentralBluetoothManager, set_manager
+
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.pt_baby import coordinator as coordinator_module
+from custom_components.pt_baby.const import (
+    CONF_MAC_ADDRESS,
+    CONF_NOTIFY_CHAR_UUID,
+    CONF_SERVICE_UUID,
+    CONF_WRITE_CHAR_UUID,
+    DOMAIN,
+    MELODIES,
+)
+from custom_components.pt_baby.coordinator import PTBabyCoordinator
+
+from .fake_client import (
+    NOTIFY_CHAR_UUID,
+    SERVICE_UUID,
+    WRITE_CHAR_UUID,
+    FakeBluetoothManager,
+    FakeConnector,
+    FakeLinkProfile,
+)
+
+ADDRESS = "AA:BB:CC:DD:EE:01"
+MANIFEST = Path(__file__).parent.parent / "custom_components" / DOMAIN / "manifest.json"
+
+
+def percentiles(samples: list[float]) -> dict[str, Any]:
+    """Nearest-rank p50/p95/p99 plus mean and max, in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "p50": rank(50),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class TimedLock(asyncio.Lock):
+    """asyncio.Lock that records how long each acquire waited."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits: list[float] = []
+
+    async def acquire(self) -> bool:
+        started = time.perf_counter()
+        result = await super().acquire()
+        self.waits.append(time.perf_counter() - started)
+        return result
+
+
+class Bench:
+    """One Home Assistant instance with one coordinator on a fake link."""
+
+    def __init__(self, profile: FakeLinkProfile, config_dir: str) -> None:
+        self.profile = profile
+        self.config_dir = config_dir
+        self.connector = FakeConnector(profile)
+        self.hass: HomeAssistant | None = None
+        self.coordinator: PTBabyCoordinator | None = None
+        self.coordinators: list[PTBabyCoordinator] = []
+        self.lock = TimedLock()
+        self.failures = 0
+        self._patches = ExitStack()
+
+    async def __aenter__(self) -> Bench:
+        hass = self.hass = HomeAssistant(self.config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+
+        device = BLEDevice(ADDRESS, "PT-BABY bench", {"source": "bench"}, rssi=-60)
+        bluetooth = coordinator_module.bluetooth
+        for target, name, value in (
+            (coordinator_module, "establish_connection", self.connector.establish_connection),
+            (bluetooth, "async_ble_device_from_address", lambda *args, **kwargs: device),
+            (bluetooth, "async_scanner_devices_by_address", lambda *args, **kwargs: []),
+            (bluetooth, "async_last_service_info", lambda *args, **kwargs: None),
+            (bluetooth, "async_register_callback", lambda *args, **kwargs: lambda: None),
+            (bluetooth, "async_track_unavailable", lambda *args, **kwargs: lambda: None),
+        ):
+            self._patches.enter_context(patch.object(target, name, value))
+
+        self.coordinator = await self.async_add_coordinator(ADDRESS, self.lock)
+        return self
+
+    async def async_add_coordinator(
+        self,
+        address: str,
+        lock: asyncio.Lock | None = None,
+        notify_char_uuid: str | None = NOTIFY_CHAR_UUID,
+    ) -> PTBabyCoordinator:
+        """Set up one more cradle sharing the same fake adapter."""
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="PT-BABY bench",
+            data={
+                CONF_MAC_ADDRESS: address,
+                CONF_SERVICE_UUID: SERVICE_UUID,
+                CONF_WRITE_CHAR_UUID: WRITE_CHAR_UUID,
+                CONF_NOTIFY_CHAR_UUID: notify_char_uuid,
+            },
+            source="user",
+        )
+        # Як MockConfigEntry.add_to_hass: запис без налаштування інтеграції
+        self.hass.config_entries._entries[entry.entry_id] = entry
+        coordinator = PTBabyCoordinator(self.hass, entry)
+        if lock is not None:
+            coordinator._link_lock = lock
+        await coordinator.async_load()
+        await coordinator.async_refresh()
+        self.coordinators.append(coordinator)
+        return coordinator
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for coordinator in self.coordinators:
+            await coordinator.async_shutdown()
+        self._patches.close()
+        await self.hass.async_stop(force=True)
+
+    async def timed(self, coro) -> float:
+        """Await one command and return its latency; failures still count."""
+        started = time.perf_counter()
+        try:
+            await coro
+        except UpdateFailed:
+            self.failures += 1
+        return time.perf_counter() - started
+
+
+async def scenario_sequential(bench: Bench, commands: int) -> dict[str, Any]:
+    """Back-to-back commands on a warm link."""
+    coordinator = bench.coordinator
+    await coordinator.async_turn_on()
+    samples = [
+        await bench.timed(coordinator.async_set_melody(index % 9 + 1))
+        for index in range(commands)
+    ]
+    return {"latency": percentiles(samples)}
+
+
+async def scenario_burst(bench: Bench, size: int, rounds: int) -> dict[str, Any]:
+    """Many callers at once, as when a scene fires several entities."""
+    coordinator = bench.coordinator
+    samples: list[float] = []
+    elapsed = 0.0
+    writes_before = bench.connector.writes
+    for _ in range(rounds):
+        jobs = []
+        for index in range(size):
+            if index % 3 == 0:
+                jobs.append(coordinator.async_set_swing_speed(index % 5 + 1))
+            elif index % 3 == 1:
+                jobs.append(coordinator.async_set_melody(index % 9 + 1))
+            else:
+                jobs.append(coordinator.async_turn_on())
+        started = time.perf_counter()
+        samples.extend(await asyncio.gather(*(bench.timed(job) for job in jobs)))
+        elapsed += time.perf_counter() - started
+    return {
+        "latency": percentiles(samples),
+        "callers_per_second": round(size * rounds / elapsed, 1),
+        "writes": bench.connector.writes - writes_before,
+    }
+
+
+async def scenario_reconnect(bench: Bench, cycles: int) -> dict[str, Any]:
+    """Drop the link, then measure connect time and first command latency."""
+    coordinator = bench.coordinator
+    connect_times: list[float] = []
+    first_command: list[float] = []
+    for index in range(cycles):
+        if bench.connector.client:
+            await bench.connector.client.disconnect()
+        first_command.append(await bench.timed(coordinator.async_set_swing_speed(index % 5 + 1)))
+        connect_times.append(coordinator.connection_stats["last_connect_duration"])
+    return {
+        "connect": percentiles(connect_times),
+        "first_command": percentiles(first_command),
+    }
+
+
+async def scenario_stop(bench: Bench, backlogs: list[int]) -> dict[str, Any]:
+    """Power-off latency with lower-priority work already queued."""
+    coordinator = bench.coordinator
+    results: dict[str, Any] = {}
+    for backlog in backlogs:
+        await coordinator.async_turn_on()
+        # Кожна послідовність - окремий клас, тож вони не зливаються
+        queued = [
+            asyncio.ensure_future(
+                bench.timed(
+                    coordinator.async_run_sequence(
+                        [{"action": "melody", "value": index % 9 + 1}]
+                    )
+                )
+            )
+            for index in range(backlog)
+        ]
+        speed = asyncio.ensure_future(bench.timed(coordinator.async_set_swing_speed(3)))
+        await asyncio.sleep(0)
+        stop = await bench.timed(coordinator.async_turn_off())
+        await asyncio.gather(speed, *queued)
+        results[f"backlog_{backlog}"] = round(stop * 1000, 2)
+    # Вимкнення не поглинає мелодію, що чекає в черзі
+    await coordinator.async_turn_on()
+    melody = asyncio.ensure_future(bench.timed(coordinator.async_set_melody(7)))
+    speed = asyncio.ensure_future(bench.timed(coordinator.async_set_swing_speed(2)))
+    await asyncio.sleep(0)
+    await bench.timed(coordinator.async_turn_off())
+    await asyncio.gather(melody, speed)
+    return {
+        "stop_ms": results,
+        "melody_kept": bench.connector.client.writes[-1] == MELODIES[7]
+        and coordinator.data["current_melody"] == 7,
+    }
+
+
+async def scenario_sleepy_sequence(profile: FakeLinkProfile, delay: float) -> dict[str, Any]:
+    """A sequence whose step delay outlasts the device's awake window."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with Bench(replace(profile, sleep_after=delay / 2), config_dir) as bench:
+            coordinator = bench.coordinator
+            started = time.perf_counter()
+            try:
+                await coordinator.async_run_sequence(
+                    [
+                        {"action": "speed", "value": 2, "delay": delay},
+                        {"action": "melody", "value": 4},
+                    ]
+                )
+                error = None
+            except UpdateFailed as err:
+                error = str(err)
+            return {
+                "ok": error is None,
+                "error": error,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "writes": [write for client in bench.connector.clients for write in client.writes],
+                "ignored_writes": bench.connector.device.ignored,
+                "wake": coordinator.connection_diagnostics()["wake"],
+            }
+
+
+async def scenario_paths(profile: FakeLinkProfile) -> dict[str, Any]:
+    """Connect through Home Assistant's client wrapper with two paths.
+
+    The coordinator only sees the weak proxy, but the wrapper asks the
+    bluetooth manager and connects through the strong one; stats and the
+    connection slot must follow the path that was actually used.
+    """
+    rssi_by_source = {"near": -50, "far": -80}
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with Bench(profile, config_dir) as bench:
+            manager = FakeBluetoothManager(bench.connector, rssi_by_source)
+            previous = CentralBluetoothManager.manager
+            set_manager(manager)
+            far = BLEDevice(ADDRESS, "PT-BABY bench", {"source": "far"})
+            bluetooth = coordinator_module.bluetooth
+            try:
+                with ExitStack() as patches:
+                    for target, name, value in (
+                        (coordinator_module, "establish_connection", bleak_retry_connector.establish_connection),
+                        (coordinator_module, "BleakClientWithServiceCache", HaBleakClientWithServiceCache),
+                        (bluetooth, "async_ble_device_from_address", lambda *args, **kwargs: far),
+                    ):
+                        patches.enter_context(patch.object(target, name, value))
+                    # Без notify: фейковий бекенд лише підключається
+                    coordinator = await bench.async_add_coordinator(
+                        "AA:BB:CC:DD:EE:10", notify_char_uuid=None
+                    )
+                    async with coordinator._link_lock:
+                        await coordinator._ensure_connected()
+                    diagnostics = coordinator.connection_diagnostics()
+            finally:
+                CentralBluetoothManager.manager = previous
+            active = [
+                source for source, path in diagnostics["paths"].items() if path["active"]
+            ]
+            held = [
+                source
+                for source, slots in diagnostics["slots"]["sources"].items()
+                if any(holder["self"] for holder in slots["holders"])
+            ]
+            return {
+                "connected_via": bench.connector.client.source,
+                "active_path": active[0] if active else None,
+                "slot_source": held[0] if len(held) == 1 else held,
+                "paths": sorted(diagnostics["paths"]),
+            }
+
+
+async def scenario_fleet(
+    profile: FakeLinkProfile, fleet_sizes: list[int], commands: int
+) -> dict[str, Any]:
+    """Several cradles on one adapter with few connection slots."""
+    results: dict[str, Any] = {}
+    for size in fleet_sizes:
+        with tempfile.TemporaryDirectory() as config_dir:
+            async with Bench(profile, config_dir) as bench:
+                fleet = [bench.coordinator]
+                for index in range(1, size):
+                    fleet.append(
+                        await bench.async_add_coordinator(f"AA:BB:CC:DD:EE:{index + 1:02X}")
+                    )
+
+                async def drive(coordinator: PTBabyCoordinator) -> list[float]:
+                    return [
+                        await bench.timed(coordinator.async_set_melody(index % 9 + 1))
+                        for index in range(commands)
+                    ]
+
+                started = time.perf_counter()
+                samples = await asyncio.gather(*(drive(cradle) for cradle in fleet))
+                elapsed = time.perf_counter() - started
+                results[f"cradles_{size}"] = {
+                    "latency": percentiles([sample for cradle in samples for sample in cradle]),
+                    "commands_per_second": round(size * commands / elapsed, 1),
+                    "failed_commands": bench.failures,
+                    "slot_failures": bench.connector.slot_failures,
+                    "evictions": sum(
+                        cradle.connection_stats["evictions"] for cradle in fleet
+                    ),
+                }
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    profile = FakeLinkProfile(
+        connect_latency=args.connect_latency,
+        write_latency=args.write_latency,
+        notify_latency=args.notify_latency,
+        drop_rate=args.drop_rate,
+        echo=not args.no_echo,
+        seed=args.seed,
+    )
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with Bench(profile, config_dir) as bench:
+            results["sequential"] = await scenario_sequential(bench, args.commands)
+            results["burst"] = await scenario_burst(bench, args.burst, args.rounds)
+            results["reconnect"] = await scenario_reconnect(bench, args.reconnects)
+            results["stop"] = await scenario_stop(bench, [0, 5, 20, 50])
+            results["lock_wait"] = percentiles(bench.lock.waits)
+            diagnostics = bench.coordinator.connection_diagnostics()
+            results["coordinator"] = {
+                key: diagnostics[key] for key in ("queue", "wake", "acks")
+            }
+            results["coordinator"]["metrics"] = bench.coordinator.metrics.as_dict()
+            results["coordinator"]["failed_commands"] = bench.failures
+            results["coordinator"]["dropped_writes"] = bench.connector.dropped
+
+    results["sleepy_sequence"] = await scenario_sleepy_sequence(profile, args.sleep_delay)
+    results["paths"] = await scenario_paths(profile)
+
+    fleet_profile = replace(profile, adapter_slots=args.adapter_slots)
+    results["fleet"] = await scenario_fleet(fleet_profile, [1, 2, 4, 6], args.fleet_commands)
+
+    return {
+        "version": json.loads(MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "profile": asdict(profile),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", "-o", type=Path, help="write JSON results here")
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--burst", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--reconnects", type=int, default=20)
+    parser.add_argument("--fleet-commands", type=int, default=20)
+    parser.add_argument("--adapter-slots", type=int, default=3)
+    parser.add_argument(
+        "--sleep-delay",
+        type=float,
+        default=4.0,
+        help="step delay of the sleepy sequence; the device sleeps after half of it",
+    )
+    parser.add_argument("--connect-latency", type=float, default=0.5)
+    parser.add_argument("--write-latency", type=float, default=0.01)
+    parser.add_argument("--notify-latency", type=float, default=0.02)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--no-echo", action="store_true", help="device does not echo commands")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    # Помилки окремих команд під втратами очікувані
+    logging.getLogger(coordinator_module.__name__).setLevel(logging.CRITICAL)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""In-process stand-in for BleakClientWithServiceCache.
+
+``FakeBluetoothManager`` goes one level lower: it stands in for the
+bluetooth manager, so Home Assistant's own client wrapper picks the path.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from habluetooth import BluetoothScannerDevice, HaBluetoothConnector
+
+from custom_components.pt_baby.const import CMD_POWER_ON
+
+SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
+WRITE_CHAR_UUID = "0000fff1-0000-1000-8000-00805f9b34fb"
+NOTIFY_CHAR_UUID = "0000fff2-0000-1000-8000-00805f9b34fb"
+
+
+@dataclass
+class FakeLinkProfile:
+    """Timing and loss of the simulated radio link (seconds, 0..1)."""
+
+    connect_latency: float = 0.5
+    write_latency: float = 0.01
+    notify_latency: float = 0.02
+    drop_rate: float = 0.0
+    echo: bool = True
+    seed: int | None = None
+    # Скільки з'єднань одночасно тримає адаптер (None - без обмеження)
+    adapter_slots: int | None = None
+    # Через скільки секунд без команд пристрій засинає (None - ніколи)
+    sleep_after: float | None = None
+
+
+class FakeDevice:
+    """Radio-side state of the cradle that outlives any one connection."""
+
+    def __init__(self, profile: FakeLinkProfile) -> None:
+        self.profile = profile
+        self.last_command: float | None = None
+        self.ignored = 0
+
+    def accept(self, command: str) -> bool:
+        """Whether the cradle hears ``command``; asleep, it only hears the wake."""
+        now = asyncio.get_running_loop().time()
+        sleep_after = self.profile.sleep_after
+        asleep = sleep_after is not None and (
+            self.last_command is None or now - self.last_command > sleep_after
+        )
+        if asleep and command != CMD_POWER_ON:
+            self.ignored += 1
+            return False
+        self.last_command = now
+        return True
+
+
+class _FakeCharacteristic:
+    def __init__(self, uuid: str, handle: int, properties: list[str]) -> None:
+        self.uuid = uuid
+        self.handle = handle
+        self.properties = properties
+
+
+class _FakeService:
+    def __init__(self, uuid: str, handle: int, characteristics: list[_FakeCharacteristic]) -> None:
+        self.uuid = uuid
+        self.handle = handle
+        self.description = "PT Baby"
+        self.characteristics = characteristics
+
+
+class FakeServiceCollection:
+    """Minimal BleakGATTServiceCollection with one write and one notify char."""
+
+    def __init__(self) -> None:
+        self._chars = [
+            _FakeCharacteristic(WRITE_CHAR_UUID, 3, ["write-without-response", "write"]),
+            _FakeCharacteristic(NOTIFY_CHAR_UUID, 5, ["notify"]),
+        ]
+        self._services = [_FakeService(SERVICE_UUID, 1, self._chars)]
+
+    def __iter__(self):
+        return iter(self._services)
+
+    def get_characteristic(self, specifier: int | str) -> _FakeCharacteristic | None:
+        for char in self._chars:
+            if specifier in (char.handle, char.uuid):
+                return char
+        return None
+
+
+class FakeBleakClient:
+    """Fake client that echoes writes as notifications.
+
+    Writes are lost with ``drop_rate`` probability: the device neither
+    applies nor echoes them, like a packet dropped on the air.
+    """
+
+    def __init__(
+        self,
+        profile: FakeLinkProfile,
+        disconnected_callback: Callable[[FakeBleakClient], None] | None,
+        rng: random.Random,
+        device: FakeDevice | None = None,
+    ) -> None:
+        self.profile = profile
+        self.device = device or FakeDevice(profile)
+        self.services = FakeServiceCollection()
+        self.is_connected = True
+        self.writes: list[str] = []
+        self.dropped = 0
+        self._rng = rng
+        self._disconnected_callback = disconnected_callback
+        self._notify: Callable[[Any, bytearray], None] | None = None
+
+    async def start_notify(self, char: Any, callback: Callable[[Any, bytearray], None]) -> None:
+        self._notify = callback
+
+    async def write_gatt_char(self, char: Any, data: bytes, response: bool = False) -> None:
+        if not self.is_connected:
+            raise ConnectionError("Not connected")
+        await asyncio.sleep(self.profile.write_latency)
+        if self._rng.random() < self.profile.drop_rate:
+            self.dropped += 1
+            return
+        if not self.device.accept(data.decode()):
+            return
+        self.writes.append(data.decode())
+        if self.profile.echo and self._notify:
+            asyncio.get_running_loop().call_later(
+                self.profile.notify_latency, self._echo, bytearray(data)
+            )
+
+    def _echo(self, data: bytearray) -> None:
+        if self.is_connected and self._notify:
+            self._notify(NOTIFY_CHAR_UUID, data)
+
+    async def clear_cache(self) -> bool:
+        return True
+
+    async def disconnect(self) -> bool:
+        if not self.is_connected:
+            return True
+        self.is_connected = False
+        if self._disconnected_callback:
+            self._disconnected_callback(self)
+        return True
+
+
+class FakeConnector:
+    """Replacement for ``establish_connection`` that builds fake clients."""
+
+    def __init__(self, profile: FakeLinkProfile) -> None:
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.device = FakeDevice(profile)
+        self.clients: list[FakeBleakClient] = []
+        self.connects = 0
+        self.slot_failures = 0
+
+    @property
+    def client(self) -> FakeBleakClient | None:
+        return self.clients[-1] if self.clients else None
+
+    @property
+    def writes(self) -> int:
+        return sum(len(client.writes) for client in self.clients)
+
+    @property
+    def dropped(self) -> int:
+        return sum(client.dropped for client in self.clients)
+
+    async def establish_connection(
+        self,
+        client_class: type,
+        device: Any,
+        name: str,
+        disconnected_callback: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> FakeBleakClient:
+        await asyncio.sleep(self.profile.connect_latency)
+        slots = self.profile.adapter_slots
+        if slots is not None and sum(c.is_connected for c in self.clients) >= slots:
+            self.slot_failures += 1
+            raise ConnectionError("No free connection slots on the adapter")
+        self.connects += 1
+        client = FakeBleakClient(self.profile, disconnected_callback, self.rng, self.device)
+        self.clients.append(client)
+        return client
+
+
+class FakeBackend(FakeBleakClient):
+    """Bleak backend the real bluetooth client wrapper drives, one per connect."""
+
+    def __init__(
+        self,
+        connector: FakeConnector,
+        source: str,
+        device: Any,
+        disconnected_callback: Callable[[], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            connector.profile, disconnected_callback, connector.rng, connector.device
+        )
+        self.source = source
+        self.is_connected = False
+        self._connector = connector
+
+    async def connect(self, *args: Any, **kwargs: Any) -> bool:
+        await asyncio.sleep(self.profile.connect_latency)
+        self.is_connected = True
+        self._connector.connects += 1
+        self._connector.clients.append(self)
+        return True
+
+    async def disconnect(self) -> bool:
+        if not self.is_connected:
+            return True
+        self.is_connected = False
+        # Обгортка вже прив'язала себе до колбеку
+        if self._disconnected_callback:
+            self._disconnected_callback()
+        return True
+
+
+class FakeScanner:
+    """Connectable adapter or proxy as the bluetooth manager sees it."""
+
+    def __init__(self, connector: FakeConnector, source: str) -> None:
+        self.source = self.name = source
+        self.adapter_idx = None
+        self.connector = HaBluetoothConnector(
+            client=partial(FakeBackend, connector, source),
+            source=source,
+            can_connect=lambda: True,
+        )
+        self.connecting: set[str] = set()
+
+    def _score_connection_paths(self, rssi_diff: int, scanner_device: Any) -> float:
+        return scanner_device.advertisement.rssi
+
+    def _add_connecting(self, address: str) -> None:
+        self.connecting.add(address)
+
+    def _finished_connecting(self, address: str, connected: bool) -> None:
+        self.connecting.discard(address)
+
+    def _connection_failures(self, address: str) -> int:
+        return 0
+
+    def _connections_in_progress(self) -> int:
+        return len(self.connecting)
+
+    def get_allocations(self) -> None:
+        return None
+
+    def get_discovered_device_advertisement_data(self, address: str) -> None:
+        return None
+
+
+class FakeBluetoothManager:
+    """The parts of habluetooth's manager its client wrapper asks for."""
+
+    shutdown = False
+
+    def __init__(self, connector: FakeConnector, rssi_by_source: dict[str, int]) -> None:
+        self.scanners = [FakeScanner(connector, source) for source in rssi_by_source]
+        self.rssi_by_source = rssi_by_source
+
+    def async_scanner_devices_by_address(
+        self, address: str, connectable: bool
+    ) -> list[BluetoothScannerDevice]:
+        return [
+            BluetoothScannerDevice(
+                scanner,
+                BLEDevice(address, "PT-BABY bench", {"source": scanner.source}),
+                AdvertisementData(
+                    local_name="PT-BABY bench",
+                    manufacturer_data={},
+                    service_data={},
+                    service_uuids=[],
+                    tx_power=None,
+                    rssi=self.rssi_by_source[scanner.source],
+                    platform_data=(),
+                ),
+            )
+            for scanner in self.scanners
+        ]
+
+    def async_current_scanners(self) -> list[FakeScanner]:
+        return self.scanners
+
+    def get_bluez_mgmt_ctl(self) -> None:
+        return None
+
+    def async_release_connection_slot(self, device: BLEDevice) -> None:
+        return None
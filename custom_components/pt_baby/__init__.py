@@ -8,9 +8,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .coordinator import PTBabyCoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,13 +21,22 @@ PLATFORMS: list[Platform] = [
     Platform.FAN,
     Platform.MEDIA_PLAYER,
     Platform.NUMBER,
+    Platform.SENSOR,
     Platform.SWITCH,
     Platform.TEXT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up integration-wide services."""
+    await async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Baby Cradle from a config entry."""
     coordinator = PTBabyCoordinator(hass, entry)
+    await coordinator.async_load()
     
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -35,9 +47,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    # Підключення не затримує запуск HA: сутності вже є, лінк піднімається у фоні
+    coordinator.async_start()
     
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running coordinator."""
+    # Слухач викликається і на зміни data (збереження профілю пробудження),
+    # зокрема вже після вивантаження запису
+    coordinator: PTBabyCoordinator | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is None or coordinator.applied_options == dict(entry.options):
+        return
+    coordinator.async_apply_options()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
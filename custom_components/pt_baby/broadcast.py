@@ -0,0 +1,77 @@
+"""Run one logical command on many PT Baby Swing cradles at once."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DOMAIN
+from .coordinator import PTBabyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_loaded_coordinators(hass: HomeAssistant) -> list[PTBabyCoordinator]:
+    """Coordinators of every loaded entry."""
+    return [
+        coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, PTBabyCoordinator)
+    ]
+
+
+async def async_broadcast(
+    hass: HomeAssistant,
+    coordinators: list[PTBabyCoordinator],
+    steps: list[dict[str, Any]],
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Run the same sequence on every cradle in parallel.
+
+    Each cradle still goes through its own queue, and connects wait for
+    adapter slots, so the fan-out never oversubscribes the radio.
+    """
+    registry = dr.async_get(hass)
+    started = monotonic()
+
+    async def _run(coordinator: PTBabyCoordinator) -> dict[str, Any]:
+        device_started = monotonic()
+        try:
+            results = await coordinator.async_run_sequence(steps, timeout)
+        except (UpdateFailed, ValueError) as err:
+            coordinator.async_yield_slot()
+            return {
+                "success": False,
+                "error": str(err),
+                "total": round(monotonic() - device_started, 4),
+            }
+        # Решта колисок чекають слоту: звільняємо його одразу
+        coordinator.async_yield_slot()
+        return {
+            "success": True,
+            "total": round(monotonic() - device_started, 4),
+            "steps": results,
+        }
+
+    outcomes = await asyncio.gather(*(_run(coordinator) for coordinator in coordinators))
+    devices: dict[str, Any] = {}
+    for coordinator, outcome in zip(coordinators, outcomes):
+        device = registry.async_get_device(identifiers={(DOMAIN, coordinator.address)})
+        key = device.id if device else coordinator.address
+        devices[key] = {"name": coordinator.entry.title, **outcome}
+
+    failed = sum(not outcome["success"] for outcome in outcomes)
+    if failed:
+        _LOGGER.warning("Broadcast failed on %s of %s cradles", failed, len(coordinators))
+    return {
+        "total": round(monotonic() - started, 4),
+        "succeeded": len(outcomes) - failed,
+        "failed": failed,
+        "devices": devices,
+    }
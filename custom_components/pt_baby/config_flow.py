@@ -14,8 +14,11 @@ from homeassistant.components.bluetooth import (
     async_ble_device_from_address,
 )
 from homeassistant.const import CONF_ADDRESS
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
+from .gatt import NOTIFY_PROPERTIES, WRITE_PROPERTIES, autodetect, serialize_services
+from .handoff import ConnectionHandoff, async_offer
 from .const import (
     DOMAIN,
     CONF_MAC_ADDRESS,
@@ -23,6 +26,14 @@ from .const import (
     CONF_SERVICE_UUID,
     CONF_WRITE_CHAR_UUID,
     CONF_NOTIFY_CHAR_UUID,
+    CONF_IDLE_TIMEOUT,
+    CONF_PRECONNECT,
+    CONF_TRACE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PRECONNECT,
+    DEFAULT_TRACE,
+    MIN_IDLE_TIMEOUT,
+    MAX_IDLE_TIMEOUT,
     LOCAL_NAME_PREFIX,
 )
 
@@ -39,6 +50,16 @@ class PTBabyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovered_device_address: str | None = None
         self._discovered_device_name: str | None = None
         self._cached_gatt: tuple[str, str, str | None] | None = None
+        # Одне з'єднання на весь flow; після створення запису - координатору
+        self._handoff: ConnectionHandoff | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> PTBabyOptionsFlow:
+        """Get the options flow for this handler."""
+        return PTBabyOptionsFlow(config_entry)
 
     def _is_pt_baby(self, name: str | None) -> bool:
         """Check if bluetooth name matches PT-BABY prefix."""
@@ -46,55 +67,59 @@ class PTBabyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return False
         return name.upper().startswith(LOCAL_NAME_PREFIX)
 
-    async def _detect_gatt(
-        self,
-        address: str,
-    ) -> tuple[str, str, str | None]:
-        """Try to autodetect service and characteristics."""
+    async def _async_connect(self, address: str) -> ConnectionHandoff:
+        """Connect once and enumerate the GATT table for the whole flow."""
+        if self._handoff and self._handoff.is_connected:
+            return self._handoff
+
         device = async_ble_device_from_address(self.hass, address, connectable=True)
         if not device:
             raise ValueError("Device not available for GATT inspection")
 
-        _LOGGER.debug("Connecting to %s to autodetect services", address)
-        client = await establish_connection(
-            BleakClientWithServiceCache, device, name=address
+        _LOGGER.debug("Connecting to %s to enumerate services", address)
+        handoff = ConnectionHandoff(address)
+        handoff.client = await establish_connection(
+            BleakClientWithServiceCache,
+            device,
+            name=address,
+            disconnected_callback=handoff.disconnected,
         )
+        handoff.table = serialize_services(handoff.client.services)
+        self._handoff = handoff
+        return handoff
 
-        service_uuid: str | None = None
-        write_char: str | None = None
-        notify_char: str | None = None
-
-        try:
-            for service in client.services:
-                candidate_write: str | None = None
-                candidate_notify: str | None = None
-                for char in service.characteristics:
-                    props = set(char.properties)
-                    uuid = char.uuid.lower()
-
-                    if "write-without-response" in props or "write" in props:
-                        candidate_write = candidate_write or uuid
-                    if "notify" in props or "indicate" in props:
-                        candidate_notify = candidate_notify or uuid
-
-                if candidate_write:
-                    service_uuid = service.uuid.lower()
-                    write_char = candidate_write
-                    notify_char = candidate_notify
-                    _LOGGER.debug(
-                        "Selected service %s write %s notify %s",
-                        service_uuid,
-                        write_char,
-                        notify_char,
-                    )
-                    break
-        finally:
-            await client.disconnect()
-
-        if not service_uuid or not write_char:
+    def _detect_gatt(self, table: list[dict[str, Any]]) -> tuple[str, str, str | None]:
+        """Try to autodetect service and characteristics."""
+        if not (selected := autodetect(table)):
             raise ValueError("No writable characteristic found")
 
-        return service_uuid, write_char, notify_char
+        _LOGGER.debug("Selected service %s write %s notify %s", *selected)
+        return selected
+
+    def _create_entry(
+        self, service_uuid: str, write_char: str, notify_char: str | None
+    ) -> FlowResult:
+        """Create the entry and park the live connection for the coordinator."""
+        if self._handoff and self._handoff.is_connected:
+            async_offer(self.hass, self._handoff)
+        self._handoff = None
+        return self.async_create_entry(
+            title=self._discovered_device_name or "PT Baby Swing",
+            data={
+                CONF_MAC_ADDRESS: self._discovered_device_address,
+                CONF_DEVICE_NAME: self._discovered_device_name,
+                CONF_SERVICE_UUID: service_uuid,
+                CONF_WRITE_CHAR_UUID: write_char,
+                CONF_NOTIFY_CHAR_UUID: notify_char,
+            },
+        )
+
+    @callback
+    def async_remove(self) -> None:
+        """Drop the connection if the flow is abandoned."""
+        if self._handoff:
+            self.hass.async_create_task(self._handoff.async_disconnect())
+            self._handoff = None
 
     async def async_step_bluetooth(
         self, discovery_info: BluetoothServiceInfoBleak
@@ -174,90 +199,59 @@ class PTBabyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             # Користувач вибрав UUID, створюємо інтеграцію
-            return self.async_create_entry(
-                title=self._discovered_device_name or "PT Baby Swing",
-                data={
-                    CONF_MAC_ADDRESS: self._discovered_device_address,
-                    CONF_DEVICE_NAME: self._discovered_device_name,
-                    CONF_SERVICE_UUID: user_input[CONF_SERVICE_UUID],
-                    CONF_WRITE_CHAR_UUID: user_input[CONF_WRITE_CHAR_UUID],
-                    CONF_NOTIFY_CHAR_UUID: user_input[CONF_NOTIFY_CHAR_UUID],
-                },
+            return self._create_entry(
+                user_input[CONF_SERVICE_UUID],
+                user_input[CONF_WRITE_CHAR_UUID],
+                user_input[CONF_NOTIFY_CHAR_UUID],
             )
 
-        # Спроба автоматичного визначення
+        # Одне підключення і для автовизначення, і для ручного вибору
+        table: list[dict[str, Any]] = []
         try:
-            self._cached_gatt = await self._detect_gatt(self._discovered_device_address)
-            service_uuid, write_char, notify_char = self._cached_gatt
-            _LOGGER.info(
-                "Auto-detected GATT for %s: service=%s write=%s notify=%s",
-                self._discovered_device_address,
-                service_uuid,
-                write_char,
-                notify_char,
-            )
-            return self.async_create_entry(
-                title=self._discovered_device_name or "PT Baby Swing",
-                data={
-                    CONF_MAC_ADDRESS: self._discovered_device_address,
-                    CONF_DEVICE_NAME: self._discovered_device_name,
-                    CONF_SERVICE_UUID: service_uuid,
-                    CONF_WRITE_CHAR_UUID: write_char,
-                    CONF_NOTIFY_CHAR_UUID: notify_char,
-                },
-            )
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.warning("Autodetect failed, falling back to manual: %s", err)
-
-        # Підключаємось до пристрою, щоб отримати список UUID
-        address = self._discovered_device_address
-        device = async_ble_device_from_address(self.hass, address, connectable=True)
-
-        if not device:
+            handoff = await self._async_connect(self._discovered_device_address)
+            table = handoff.table
+        except ValueError:
             return self.async_abort(reason="cannot_connect")
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.error("Error fetching services: %s", err)
+            errors["base"] = "cannot_connect"
 
-        # Списки для Dropdown меню
+        # Спроба автоматичного визначення
+        if table:
+            try:
+                self._cached_gatt = self._detect_gatt(table)
+                service_uuid, write_char, notify_char = self._cached_gatt
+                _LOGGER.info(
+                    "Auto-detected GATT for %s: service=%s write=%s notify=%s",
+                    self._discovered_device_address,
+                    service_uuid,
+                    write_char,
+                    notify_char,
+                )
+                return self._create_entry(service_uuid, write_char, notify_char)
+            except ValueError as err:
+                _LOGGER.warning("Autodetect failed, falling back to manual: %s", err)
+
+        # Списки для Dropdown меню з тієї ж таблиці
         services_list = {}
         write_chars_list = {}
         notify_chars_list = {}
 
-        try:
-            _LOGGER.debug("Connecting to %s to fetch UUIDs", address)
-            client = await establish_connection(
-                BleakClientWithServiceCache, device, name=address
-            )
-
-            try:
-                # Перебираємо всі сервіси та характеристики
-                for service in client.services:
-                    srv_uuid = service.uuid.lower()
-                    services_list[srv_uuid] = f"{srv_uuid} ({service.description or 'Service'})"
-
-                    for char in service.characteristics:
-                        uuid = char.uuid.lower()
-                        props = ",".join(char.properties)
-                        label = f"{uuid} [{props}]"
-
-                        # Розподіляємо по списках залежно від властивостей
-                        if "write" in char.properties or "write-without-response" in char.properties:
-                            write_chars_list[uuid] = label
+        for service in table:
+            srv_uuid = service["uuid"]
+            services_list[srv_uuid] = f"{srv_uuid} ({service['description'] or 'Service'})"
 
-                        if "notify" in char.properties or "indicate" in char.properties:
-                            notify_chars_list[uuid] = label
+            for char in service["characteristics"]:
+                uuid = char["uuid"]
+                props = set(char["properties"])
+                label = f"{uuid} [{','.join(char['properties'])}]"
 
-                        # Також додаємо у списки "все підряд", якщо властивості не чіткі
-                        # (опціонально, але краще мати вибір)
+                # Розподіляємо по списках залежно від властивостей
+                if props & WRITE_PROPERTIES:
+                    write_chars_list[uuid] = label
 
-            finally:
-                await client.disconnect()
-
-        except Exception as err:
-            _LOGGER.error("Error fetching services: %s", err)
-            errors["base"] = "cannot_connect"
-            # Якщо не вдалося підключитися, дамо можливість ввести вручну (текстові поля)
-            services_list = {}
-            write_chars_list = {}
-            notify_chars_list = {}
+                if props & NOTIFY_PROPERTIES:
+                    notify_chars_list[uuid] = label
 
         # Формуємо схему. Якщо списки пусті - Text Input, якщо є - Select
         schema_dict = {}
@@ -287,4 +281,42 @@ class PTBabyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={
                 "device_name": self._discovered_device_name
             }
-        )
\ No newline at end of file
+        )
+
+
+class PTBabyOptionsFlow(config_entries.OptionsFlow):
+    """Connection manager options."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=MIN_IDLE_TIMEOUT, max=MAX_IDLE_TIMEOUT)
+                    ),
+                    vol.Required(
+                        CONF_PRECONNECT,
+                        default=options.get(CONF_PRECONNECT, DEFAULT_PRECONNECT),
+                    ): bool,
+                    vol.Required(
+                        CONF_TRACE,
+                        default=options.get(CONF_TRACE, DEFAULT_TRACE),
+                    ): bool,
+                }
+            ),
+        )
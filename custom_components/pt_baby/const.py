@@ -2,6 +2,10 @@
 from homeassistant.const import Platform
 
 DOMAIN = "pt_baby"
+# Підключення з config flow, що чекають на координатор
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+DATA_SLOTS = f"{DOMAIN}_slots"
+DATA_FAN_GROUP = f"{DOMAIN}_fan_group"
 LOCAL_NAME_PREFIX = "PT-BABY"
 
 # UUID (ключі для конфігурації)
@@ -10,6 +14,13 @@ CONF_WRITE_CHAR_UUID = "write_char_uuid"
 CONF_NOTIFY_CHAR_UUID = "notify_char_uuid"
 CONF_MAC_ADDRESS = "mac_address"
 CONF_DEVICE_NAME = "device_name"
+# Вивчений профіль пробудження (зберігається в entry.data)
+CONF_WAKE_PROFILE = "wake_profile"
+
+# Опції (options flow)
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_PRECONNECT = "preconnect"
+CONF_TRACE = "trace"
 
 # --- КОМАНДИ ---
 # Важливо: cmd38 - це пробудження. Без нього нічого не працює.
@@ -41,11 +52,201 @@ MELODIES = {
 
 CMD_MELODY_OFF = "cmd00" # Команда зупинки музики (якщо є)
 
+# --- NOTIFY ---
+# Пристрій відповідає ехо-кодом прийнятої команди ("cmd12").
+# Кадр стану з кнопок пристрою: "st:p=1,s=2,m=4,t=30,i=0"
+# (p - живлення, s - швидкість, m - мелодія (0 = вимк.), t - таймер, i - індукція)
+FRAME_STATUS_PREFIX = "st:"
+FRAME_SEPARATORS = "\r\n\0;"
+
 # Атрибути для HA
 ATTR_SWING_SPEED = "swing_speed"
 ATTR_MELODY = "melody"
 ATTR_TIMER = "timer"
 ATTR_INDUCTION_MODE = "induction_mode"
 
+# --- СЕРВІСИ ---
+SERVICE_RUN_SEQUENCE = "run_sequence"
+ATTR_STEPS = "steps"
+ATTR_ACTION = "action"
+ATTR_VALUE = "value"
+ATTR_DELAY = "delay"
+ATTR_TIMEOUT = "timeout"
+
+SERVICE_BROADCAST = "broadcast"
+SERVICE_EXPORT_TRACE = "export_trace"
+ATTR_CLEAR = "clear"
+SERVICE_START_EMULATOR = "start_emulator"
+SERVICE_STOP_EMULATOR = "stop_emulator"
+ATTR_COUNT = "count"
+ATTR_CONNECT_LATENCY = "connect_latency"
+ATTR_WRITE_LATENCY = "write_latency"
+ATTR_LOSS = "loss"
+ATTR_SLEEP_AFTER = "sleep_after"
+
+# Дії кроків послідовності
+STEP_TURN_ON = "turn_on"
+STEP_TURN_OFF = "turn_off"
+STEP_SPEED = "speed"
+STEP_MELODY = "melody"
+STEP_MELODY_OFF = "melody_off"
+STEP_TIMER = "timer"
+STEP_INDUCTION = "induction"
+STEP_RAW = "raw"
+SEQUENCE_ACTIONS = [
+    STEP_TURN_ON,
+    STEP_TURN_OFF,
+    STEP_SPEED,
+    STEP_MELODY,
+    STEP_MELODY_OFF,
+    STEP_TIMER,
+    STEP_INDUCTION,
+    STEP_RAW,
+]
+# Максимальна пауза між кроками (с)
+SEQUENCE_MAX_DELAY = 30
+
+# Бюджет часу команди: черга, лінк, підключення, пробудження і запис (с).
+# Для послідовностей до нього додаються паузи між кроками
+COMMAND_TIMEOUT = 15.0
+MAX_COMMAND_TIMEOUT = 300
+# Запас понад дедлайн, після якого викликач перестає чекати обробник черги
+COMMAND_DEADLINE_GRACE = 1.0
+
+# Класи команд для черги: у кожному класі відправляється лише найновіша
+COMMAND_CLASS_POWER = "power"
+COMMAND_CLASS_SPEED = "speed"
+COMMAND_CLASS_MELODY = "melody"
+COMMAND_CLASS_RAW = "raw"
+COMMAND_CLASS_SEQUENCE = "sequence"
+# Команди, що стають першими в черзі і не чекають на пробудження
+PRIORITY_COMMANDS = (CMD_POWER_OFF,)
+# Класи, чиї команди в черзі втрачають сенс після вимкнення;
+# мелодія грає і без гойдання, тож її команди лишаються в черзі
+PREEMPTED_CLASSES = (COMMAND_CLASS_POWER, COMMAND_CLASS_SPEED)
+
 # Інтервал між "пробудженням" та відправкою основної команди
-WAKE_DELAY = 0.35
\ No newline at end of file
+# (початкове значення, далі вивчається з підтверджень)
+WAKE_DELAY = 0.35
+# Мінімальний інтервал між командами в послідовності без ехо-підтверджень
+SEQUENCE_SPACING = 0.05
+
+# --- АДАПТИВНЕ ПРОБУДЖЕННЯ ---
+WAKE_MIN_DELAY = 0.05
+WAKE_MAX_DELAY = 1.5
+# Максимальне очікування підтвердження пробудження
+WAKE_ACK_TIMEOUT = 1.0
+# Початкове вікно, в якому пристрій вважається активним (с)
+WAKE_AWAKE_WINDOW = 2.0
+# Вікна сну, ближчі за це, вважаються знайденими (с)
+WAKE_PROBE_RESOLUTION = 1.0
+WAKE_LATENCY_ALPHA = 0.3
+WAKE_PROFILE_SAVE_DELAY = 60
+
+# --- ПІДТВЕРДЖЕННЯ КОМАНД (ехо в notify) ---
+ACK_TIMEOUT = 1.0
+ACK_MIN_TIMEOUT = 0.15
+# Повторні відправки втраченої команди
+ACK_RETRIES = 2
+# Скільки команд поспіль без ехо, щоб вважати, що пристрій його не надсилає
+ACK_MAX_MISSES = 3
+ACK_RTT_ALPHA = 0.3
+
+# --- ПІДКЛЮЧЕННЯ ---
+# Скільки секунд тримати з'єднання після останньої команди
+DEFAULT_IDLE_TIMEOUT = 120
+# 0 = тримати з'єднання постійно (повноцінний push зі стану кнопок)
+MIN_IDLE_TIMEOUT = 0
+MAX_IDLE_TIMEOUT = 3600
+DEFAULT_PRECONNECT = True
+# Пауза перед повторним підключенням у режимі постійного з'єднання
+RECONNECT_DELAY = 10
+
+# Історія використання: доба розбита на кошики по 15 хв
+USAGE_BUCKET_MINUTES = 15
+# Щоденне згасання ваги старих подій
+USAGE_DECAY = 0.85
+# Мінімальна вага кошика, щоб передбачити команду
+PRECONNECT_MIN_SCORE = 1.5
+# За скільки секунд до передбаченого вікна підключатися
+PRECONNECT_LEAD = 120
+
+# Скільки секунд тримати передане з config flow з'єднання без координатора
+HANDOFF_TIMEOUT = 60
+
+# --- ПРИСУТНІСТЬ (за рекламою) ---
+# Після скількох секунд без реклами вважати, що пристрою немає поруч
+PRESENCE_GONE_AFTER = 180
+ADV_INTERVAL_ALPHA = 0.2
+
+# Подія відкату оптимістичного стану після невдалої команди
+EVENT_STATE_ROLLBACK = f"{DOMAIN}_state_rollback"
+
+# --- ДОВІРА ДО СТАНУ ---
+# Скільки секунд підтверджене пристроєм значення вважається актуальним
+# (пульт на колисці може змінити стан без нашого відома)
+STATE_CONFIDENT_FOR = 120
+
+# --- СЛОТИ З'ЄДНАНЬ ---
+# Одночасних з'єднань PT Baby на один адаптер або проксі (ESPHome-проксі
+# за замовчуванням мають 3 слоти, і частину можуть займати інші інтеграції)
+CONNECTION_SLOTS = 3
+# Поки інші чекають, слот забирають у колиски, що простоює стільки секунд...
+SLOT_IDLE_AFTER = 1.0
+# ...або тримає його довше за квант, хай навіть активно надсилає
+SLOT_QUANTUM = 10.0
+
+# --- ПОВТОРИ ЗАПИСУ НА ЖИВОМУ З'ЄДНАННІ ---
+# Скільки разів повторити запис після тимчасової помилки GATT
+WRITE_RETRIES = 2
+# Пауза перед першим повтором, далі подвоюється (с)
+WRITE_RETRY_DELAY = 0.05
+
+# --- ЗАПОБІЖНИК (circuit breaker) ---
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+# Скільки невдалих підключень поспіль розмикають ланцюг
+CIRCUIT_FAILURE_THRESHOLD = 2
+# Пауза після першого розмикання, далі подвоюється (с)
+CIRCUIT_BACKOFF_BASE = 5
+CIRCUIT_BACKOFF_MAX = 300
+
+# --- ВИБІР ШЛЯХУ (адаптери та проксі) ---
+PATH_ALPHA = 0.3
+# Період напіврозпаду штрафу за невдалі підключення (с)
+PATH_FAILURE_HALF_LIFE = 600
+# Штраф (с) за кожен dB нижче PATH_RSSI_GOOD
+PATH_RSSI_GOOD = -60
+PATH_RSSI_WEIGHT = 0.02
+
+# --- МЕТРИКИ ---
+# Межі кошиків гістограм затримок (с)
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# --- ТРАСУВАННЯ ---
+DEFAULT_TRACE = False
+# Скільки подій (спанів) тримати в кільцевому буфері
+TRACE_BUFFER_SIZE = 2000
+TRACE_FILE = "pt_baby_trace_{}.jsonl"
+
+# --- ЕМУЛЯТОР (віртуальні колиски без заліза) ---
+DATA_EMULATOR = f"{DOMAIN}_emulator"
+EMULATOR_SOURCE = "pt_baby_emulator"
+EMULATOR_SERVICE_UUID = "0000fff0-0000-1000-8000-00805f9b34fb"
+EMULATOR_WRITE_CHAR_UUID = "0000fff1-0000-1000-8000-00805f9b34fb"
+EMULATOR_NOTIFY_CHAR_UUID = "0000fff2-0000-1000-8000-00805f9b34fb"
+EMULATOR_MAX_DEVICES = 100
+# Інтервал реклами віртуальних пристроїв (с)
+EMULATOR_ADV_INTERVAL = 2.0
+EMULATOR_CONNECT_LATENCY = 0.8
+EMULATOR_WRITE_LATENCY = 0.02
+EMULATOR_NOTIFY_LATENCY = 0.03
+# Скільки секунд без команд до засинання і скільки триває пробудження
+EMULATOR_SLEEP_AFTER = 5.0
+EMULATOR_WAKE_LATENCY = 0.3
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+# Стан пристрою зберігається після паузи в оновленнях (секунди)
+STATE_SAVE_DELAY = 10
@@ -2,35 +2,535 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-from datetime import timedelta
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
 from time import monotonic
 
 from bleak import BleakError
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 from bleak_retry_connector import establish_connection, BleakClientWithServiceCache
 
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .errors import ERROR_LINK_LOST, ERROR_TRANSIENT, classify_error
+from .handoff import ConnectionHandoff, async_claim
+from .gatt import find_handle, resolve_cached, serialize_services
+from .metrics import (
+    METRIC_COMMAND,
+    METRIC_CONNECT,
+    METRIC_LOCK_WAIT,
+    METRIC_LOOKUP,
+    METRIC_SLOT_WAIT,
+    METRIC_STOP,
+    METRIC_WAKE,
+    METRIC_WRITE,
+    METRIC_WRITE_RETRY,
+    PTBabyMetrics,
+)
+from .protocol import command_state, decode_notification
+from .slots import async_get_scheduler
+from .trace import PTBabyTracer
 from .const import (
     DOMAIN,
     CONF_MAC_ADDRESS,
     CONF_SERVICE_UUID,
     CONF_WRITE_CHAR_UUID,
     CONF_NOTIFY_CHAR_UUID,
+    CONF_WAKE_PROFILE,
+    CONF_IDLE_TIMEOUT,
+    CONF_PRECONNECT,
+    CONF_TRACE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_PRECONNECT,
+    DEFAULT_TRACE,
+    USAGE_BUCKET_MINUTES,
+    USAGE_DECAY,
+    PRECONNECT_MIN_SCORE,
+    PRECONNECT_LEAD,
+    STORAGE_VERSION,
+    STATE_SAVE_DELAY,
+    STORAGE_SAVE_DELAY,
+    RECONNECT_DELAY,
+    PRESENCE_GONE_AFTER,
+    STATE_CONFIDENT_FOR,
+    EVENT_STATE_ROLLBACK,
+    PATH_FAILURE_HALF_LIFE,
+    PATH_ALPHA,
+    PATH_RSSI_GOOD,
+    PATH_RSSI_WEIGHT,
+    ADV_INTERVAL_ALPHA,
+    CIRCUIT_CLOSED,
+    CIRCUIT_OPEN,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_BACKOFF_BASE,
+    CIRCUIT_BACKOFF_MAX,
+    COMMAND_CLASS_POWER,
+    COMMAND_CLASS_SPEED,
+    COMMAND_CLASS_MELODY,
+    COMMAND_CLASS_RAW,
+    COMMAND_CLASS_SEQUENCE,
+    COMMAND_DEADLINE_GRACE,
+    COMMAND_TIMEOUT,
+    PRIORITY_COMMANDS,
+    PREEMPTED_CLASSES,
+    ATTR_ACTION,
+    ATTR_VALUE,
+    ATTR_DELAY,
+    STEP_TURN_ON,
+    STEP_TURN_OFF,
+    STEP_SPEED,
+    STEP_MELODY,
+    STEP_MELODY_OFF,
+    STEP_TIMER,
+    STEP_INDUCTION,
+    STEP_RAW,
+    SEQUENCE_SPACING,
+    WRITE_RETRIES,
+    WRITE_RETRY_DELAY,
     CMD_POWER_ON,
     CMD_POWER_OFF,
     SWING_SPEEDS,
     MELODIES,
     WAKE_DELAY,
+    WAKE_MIN_DELAY,
+    WAKE_MAX_DELAY,
+    WAKE_ACK_TIMEOUT,
+    WAKE_AWAKE_WINDOW,
+    WAKE_PROBE_RESOLUTION,
+    WAKE_LATENCY_ALPHA,
+    WAKE_PROFILE_SAVE_DELAY,
+    ACK_TIMEOUT,
+    ACK_MIN_TIMEOUT,
+    ACK_RETRIES,
+    ACK_MAX_MISSES,
+    ACK_RTT_ALPHA,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Ключ стану -> атрибут координатора
+_STATE_ATTRS = {
+    "is_on": "_is_on",
+    "swing_speed": "_swing_speed",
+    "melody_on": "_melody_on",
+    "current_melody": "_current_melody",
+    "volume": "_volume",
+    "timer": "_timer",
+    "induction_mode": "_induction_mode",
+}
+
+USAGE_BUCKETS = 24 * 60 // USAGE_BUCKET_MINUTES
+
+
+@dataclass
+class _SequenceStep:
+    """One write (or state-only change) inside a connection session."""
+
+    action: str
+    value: Any = None
+    command: str | None = None
+    ensure_wake: bool = True
+    state: dict[str, Any] = field(default_factory=dict)
+    delay: float = 0.0
+    # Пріоритетна команда: пробуємо без пробудження, якщо пристрій міг не заснути
+    urgent: bool = False
+
+
+@dataclass
+class _QueuedCommand:
+    """Newest pending job of one class plus everyone waiting on it."""
+
+    steps: list[_SequenceStep]
+    on_sent: Callable[[], None] | None
+    waiters: list[asyncio.Future[Any]] = field(default_factory=list)
+    trace: int | None = None
+    # monotonic(), після якого команду вже ніхто не чекає
+    deadline: float = 0.0
+
+    @property
+    def command(self) -> str | None:
+        return self.steps[0].command if len(self.steps) == 1 else COMMAND_CLASS_SEQUENCE
+
+    @property
+    def priority(self) -> bool:
+        return self.steps[0].urgent
+
+    @property
+    def keys(self) -> set[str]:
+        """State keys the job will change once sent."""
+        keys: set[str] = set()
+        for step in self.steps:
+            keys.update(step.state)
+            if step.command:
+                keys.update(command_state(step.command))
+        return keys
+
+
+@dataclass
+class PTBabyWakeProfile:
+    """Learned wake latency and sleep timeout of one device."""
+
+    latency: float = WAKE_DELAY
+    # Найдовша пауза, після якої пристрій ще відповідав без пробудження
+    awake_for: float = WAKE_AWAKE_WINDOW
+    # Найкоротша пауза, після якої пристрій уже спав
+    asleep_after: float | None = None
+    # Чи надсилає пристрій ехо команд (None - ще невідомо)
+    acks: bool | None = None
+
+    def record_latency(self, latency: float) -> None:
+        """Blend a measured wake round trip into the estimate."""
+        latency = min(max(latency, WAKE_MIN_DELAY), WAKE_MAX_DELAY)
+        self.latency += WAKE_LATENCY_ALPHA * (latency - self.latency)
+
+    def mark_awake(self, gap: float) -> None:
+        self.awake_for = max(self.awake_for, gap)
+        if self.asleep_after is not None and self.asleep_after <= self.awake_for:
+            self.asleep_after = None
+
+    def mark_asleep(self, gap: float) -> None:
+        self.asleep_after = gap if self.asleep_after is None else min(self.asleep_after, gap)
+        if self.awake_for >= self.asleep_after:
+            self.awake_for = self.asleep_after * 0.8
+
+    @property
+    def probe_until(self) -> float:
+        """Idle gap up to which skipping the wake is worth verifying."""
+        if self.asleep_after is None:
+            return self.awake_for * 1.5
+        if self.asleep_after - self.awake_for <= WAKE_PROBE_RESOLUTION:
+            return self.awake_for
+        return (self.awake_for + self.asleep_after) / 2
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "latency": round(self.latency, 3),
+            "awake_for": round(self.awake_for, 2),
+            "asleep_after": (
+                round(self.asleep_after, 2) if self.asleep_after is not None else None
+            ),
+            "acks": self.acks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> PTBabyWakeProfile:
+        profile = cls()
+        if not data:
+            return profile
+        try:
+            profile.latency = float(data.get("latency", WAKE_DELAY))
+            profile.awake_for = float(data.get("awake_for", WAKE_AWAKE_WINDOW))
+            if data.get("asleep_after") is not None:
+                profile.asleep_after = float(data["asleep_after"])
+            profile.acks = data.get("acks")
+        except (TypeError, ValueError):
+            return cls()
+        return profile
+
+
+@dataclass
+class PTBabyPresence:
+    """Live view of the device built from its advertisements."""
+
+    last_seen: float | None = None
+    rssi: int | None = None
+    source: str | None = None
+    device: BLEDevice | None = None
+    device_source: str | None = None
+    device_rssi: int | None = None
+    interval: float | None = None
+    available: bool = True
+    advertisements: int = 0
+
+    def update(self, service_info: bluetooth.BluetoothServiceInfoBleak, now: float) -> None:
+        """Record one advertisement."""
+        if self.last_seen is not None:
+            delta = now - self.last_seen
+            if self.interval is None:
+                self.interval = delta
+            else:
+                self.interval += ADV_INTERVAL_ALPHA * (delta - self.interval)
+        self.last_seen = now
+        self.rssi = service_info.rssi
+        self.source = service_info.source
+        self.advertisements += 1
+        self.available = True
+        if not service_info.connectable:
+            return
+        # Найкраще підключуване джерело: те саме, або сильніший сигнал
+        if (
+            self.device is None
+            or self.device_source == service_info.source
+            or self.device_rssi is None
+            or service_info.rssi > self.device_rssi
+        ):
+            self.device = service_info.device
+            self.device_source = service_info.source
+            self.device_rssi = service_info.rssi
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "available": self.available,
+            "seen_ago": round(now - self.last_seen, 1) if self.last_seen else None,
+            "rssi": self.rssi,
+            "source": self.source,
+            "connectable_source": self.device_source,
+            "connectable_rssi": self.device_rssi,
+            "interval": round(self.interval, 3) if self.interval else None,
+            "advertisements": self.advertisements,
+        }
+
+
+@dataclass
+class PTBabyCircuitBreaker:
+    """Connection state machine: fail fast while the device is unreachable."""
+
+    state: str = CIRCUIT_CLOSED
+    failures: int = 0
+    # Розмикання поспіль: від них залежить пауза
+    opens: int = 0
+    retry_at: float | None = None
+    total_opens: int = 0
+
+    @property
+    def backoff(self) -> float:
+        return min(CIRCUIT_BACKOFF_BASE * 2 ** max(0, self.opens - 1), CIRCUIT_BACKOFF_MAX)
+
+    def allow(self, now: float) -> bool:
+        """Whether a connect may be attempted; half-opens once the backoff expired."""
+        if self.state == CIRCUIT_OPEN:
+            if self.retry_at is None or now < self.retry_at:
+                return False
+            self.state = CIRCUIT_HALF_OPEN
+        return True
+
+    def half_open(self) -> bool:
+        if self.state != CIRCUIT_OPEN:
+            return False
+        self.state = CIRCUIT_HALF_OPEN
+        return True
+
+    def record_success(self) -> bool:
+        """Close the circuit; return True if it was not closed."""
+        changed = self.state != CIRCUIT_CLOSED
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.retry_at = None
+        return changed
+
+    def record_failure(self, now: float) -> bool:
+        """Count a failed connect; return True if the circuit opened."""
+        self.failures += 1
+        if self.state != CIRCUIT_HALF_OPEN and self.failures < CIRCUIT_FAILURE_THRESHOLD:
+            return False
+        self.state = CIRCUIT_OPEN
+        self.opens += 1
+        self.total_opens += 1
+        self.retry_at = now + self.backoff
+        return True
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opens": self.total_opens,
+            "backoff": self.backoff if self.opens else None,
+            "retry_in": (
+                round(max(0.0, self.retry_at - now), 1)
+                if self.state == CIRCUIT_OPEN and self.retry_at is not None
+                else None
+            ),
+        }
+
+
+@dataclass
+class PTBabyPathStats:
+    """Recent connection quality through one adapter or proxy."""
+
+    source: str
+    rssi: int | None = None
+    connect_time: float | None = None
+    connect_fail_rate: float = 0.0
+    write_fail_rate: float = 0.0
+    connects: int = 0
+    connect_failures: int = 0
+    writes: int = 0
+    write_failures: int = 0
+    last_failure: float | None = None
+
+    def record_connect(self, duration: float | None) -> None:
+        if duration is None:
+            self.connect_failures += 1
+            self.connect_fail_rate = self._fail_rate(monotonic())
+            self.connect_fail_rate += PATH_ALPHA * (1 - self.connect_fail_rate)
+            self.last_failure = monotonic()
+            return
+        self.connects += 1
+        self.connect_fail_rate -= PATH_ALPHA * self.connect_fail_rate
+        if self.connect_time is None:
+            self.connect_time = duration
+        else:
+            self.connect_time += PATH_ALPHA * (duration - self.connect_time)
+
+    def record_write(self, ok: bool) -> None:
+        self.writes += 1
+        if not ok:
+            self.write_failures += 1
+        self.write_fail_rate += PATH_ALPHA * ((0.0 if ok else 1.0) - self.write_fail_rate)
+
+    def _fail_rate(self, now: float) -> float:
+        """Connect failure rate, forgiven over time so bad paths get retried."""
+        if self.last_failure is None:
+            return self.connect_fail_rate
+        return self.connect_fail_rate * 0.5 ** ((now - self.last_failure) / PATH_FAILURE_HALF_LIFE)
+
+    @property
+    def score(self) -> float:
+        """Expected seconds to a working link; lower is better.
+
+        Untried paths score on RSSI alone; after that the measured connect
+        time and failure rates decide. The score is for diagnostics: the
+        bluetooth stack chooses the path, see ``_async_connect_path``.
+        """
+        fail_rate = self._fail_rate(monotonic())
+        if self.connect_time is None:
+            rssi_penalty = (
+                max(0, PATH_RSSI_GOOD - self.rssi) * PATH_RSSI_WEIGHT
+                if self.rssi is not None
+                else 0
+            )
+            return rssi_penalty + 2 * fail_rate
+        return (
+            self.connect_time * (1 + 2 * fail_rate + self.write_fail_rate)
+            + 2 * fail_rate
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "score": round(self.score, 3),
+            "rssi": self.rssi,
+            "connect_time": round(self.connect_time, 3) if self.connect_time else None,
+            "connect_fail_rate": round(self._fail_rate(monotonic()), 3),
+            "write_fail_rate": round(self.write_fail_rate, 3),
+            "connects": self.connects,
+            "connect_failures": self.connect_failures,
+            "writes": self.writes,
+            "write_failures": self.write_failures,
+        }
+
+
+@dataclass
+class PTBabyStateConfidence:
+    """Values the device itself reported, and when."""
+
+    confirmed: dict[str, tuple[Any, float]] = field(default_factory=dict)
+
+    def confirm(self, state: dict[str, Any], now: float) -> None:
+        for key, value in state.items():
+            self.confirmed[key] = (value, now)
+
+    def forget(self) -> None:
+        self.confirmed.clear()
+
+    def matches(self, target: dict[str, Any], current: dict[str, Any], now: float) -> bool:
+        """True if every target value is both current and recently confirmed."""
+        for key, value in target.items():
+            confirmed = self.confirmed.get(key)
+            if (
+                confirmed is None
+                or confirmed[0] != value
+                or current.get(key) != value
+                or now - confirmed[1] >= STATE_CONFIDENT_FOR
+            ):
+                return False
+        return bool(target)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        return {
+            key: {"value": value, "age": round(now - at, 1)}
+            for key, (value, at) in self.confirmed.items()
+        }
+
+
+class PTBabyUsageHistory:
+    """Time-of-day histogram of command sessions used to predict the next one."""
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self._buckets: list[float] = [0.0] * USAGE_BUCKETS
+        self._day: int | None = None
+        self._last_recorded: tuple[int, int] | None = None
+
+    @staticmethod
+    def _bucket(when: datetime) -> int:
+        return (when.hour * 60 + when.minute) // USAGE_BUCKET_MINUTES
+
+    def _decay(self, when: datetime) -> None:
+        """Fade old sessions once per elapsed day."""
+        day = when.date().toordinal()
+        if self._day is not None and day > self._day:
+            factor = USAGE_DECAY ** (day - self._day)
+            self._buckets = [value * factor for value in self._buckets]
+        self._day = day
+
+    def record(self, when: datetime) -> None:
+        """Count one session per bucket per day, bursts of commands included."""
+        self._decay(when)
+        key = (when.date().toordinal(), self._bucket(when))
+        if key == self._last_recorded:
+            return
+        self._last_recorded = key
+        self._buckets[key[1]] += 1
+
+    def is_active(self, when: datetime) -> bool:
+        """Return True if ``when`` falls into a predicted usage window."""
+        self._decay(when)
+        return self._buckets[self._bucket(when)] >= PRECONNECT_MIN_SCORE
+
+    def next_window(self, after: datetime) -> datetime | None:
+        """Return the start of the next predicted bucket after ``after``."""
+        self._decay(after)
+        current = self._bucket(after)
+        bucket_start = after.replace(
+            minute=after.minute - after.minute % USAGE_BUCKET_MINUTES,
+            second=0,
+            microsecond=0,
+        )
+        for offset in range(1, USAGE_BUCKETS + 1):
+            if self._buckets[(current + offset) % USAGE_BUCKETS] >= PRECONNECT_MIN_SCORE:
+                return bucket_start + timedelta(minutes=offset * USAGE_BUCKET_MINUTES)
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize for storage."""
+        return {"buckets": [round(value, 3) for value in self._buckets], "day": self._day}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> PTBabyUsageHistory:
+        """Restore from storage, ignoring malformed data."""
+        history = cls()
+        if not data:
+            return history
+        buckets = data.get("buckets")
+        if isinstance(buckets, list) and len(buckets) == USAGE_BUCKETS:
+            history._buckets = [float(value) for value in buckets]
+            history._day = data.get("day")
+        return history
+
+
 class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Class to manage fetching Baby Cradle data."""
 
@@ -44,10 +544,138 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         self._client: BleakClientWithServiceCache | None = None
         self._device: BLEDevice | None = None
-        self._lock = asyncio.Lock()
+        # Захищає BLE-лінк між обробником черги та менеджером з'єднання
+        self._link_lock = asyncio.Lock()
+
+        # Черга команд: по одній (найновішій) команді на клас
+        self._queue: dict[str, _QueuedCommand] = {}
+        self._queue_task: asyncio.Task[None] | None = None
+        # Завдання, яке зараз передається (вже не в черзі)
+        self._sending: _QueuedCommand | None = None
+        self._sequence_ids = itertools.count(1)
+        # Запитані, але ще не підтверджені значення: ключ -> (значення, команда)
+        self._pending_state: dict[str, tuple[Any, int]] = {}
+        self._pending_ids = itertools.count(1)
+        # Відновлені після перезапуску, ще не підтверджені значення
+        self._restored: set[str] = set()
+        self._saved_state: dict[str, Any] | None = None
+        self.queue_stats: dict[str, int] = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "sent": 0,
+            "failed": 0,
+            "expired": 0,
+            "timed_out": 0,
+            "preempted": 0,
+            "noop_skipped": 0,
+            "lock_contention": 0,
+        }
+        # Записи стану сутностями та пропущені оновлення без змін
+        self.entity_stats: dict[str, int] = {"writes": 0, "skipped": 0}
+        # Гістограми затримок кожної фази відправки та (опційно) трасування
+        self.metrics = PTBabyMetrics()
+        self.tracer = PTBabyTracer()
 
         self._notify_started = False
-        self._last_wake: float | None = None
+
+        # Таблиця GATT та характеристики, знайдені за збереженими handle
+        self._gatt_table: list[dict[str, Any]] | None = None
+        self._write_char: BleakGATTCharacteristic | None = None
+        self._notify_char: BleakGATTCharacteristic | None = None
+        self.gatt_stats: dict[str, int] = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "invalidations": 0,
+            "rediscoveries": 0,
+            "handoffs": 0,
+        }
+
+        # Присутність за рекламою
+        self.presence = PTBabyPresence()
+        # Спільні для всіх колисок слоти з'єднань адаптерів
+        self._slots = async_get_scheduler(hass)
+        self._slot_source: str | None = None
+        self._has_slot = False
+        # Підтверджений пристроєм стан: для пропуску команд, що нічого не змінять
+        self.confidence = PTBabyStateConfidence()
+        self._last_link: float | None = None
+        self._presence_unsubs: list[CALLBACK_TYPE] = []
+
+        # Якість шляхів (адаптер/проксі) та поточний шлях
+        self._paths: dict[str, PTBabyPathStats] = {}
+        self._path: PTBabyPathStats | None = None
+
+        # Запобіжник: недосяжний пристрій не тримає лінк і черги
+        self.breaker = PTBabyCircuitBreaker()
+        self._cancel_half_open: CALLBACK_TYPE | None = None
+
+        # Адаптивне пробудження
+        self._wake_profile = PTBabyWakeProfile.from_dict(entry.data.get(CONF_WAKE_PROFILE))
+        self._last_activity: float | None = None
+        # Кореляція команд з їх ехо в notify
+        self._pending_acks: dict[str, list[asyncio.Future[float]]] = {}
+        self._ack_misses = 0
+        self.ack_stats: dict[str, Any] = {
+            "acked": 0,
+            "retransmits": 0,
+            "lost": 0,
+            "rtt_last": None,
+            "rtt_avg": None,
+            "rtt_min": None,
+            "rtt_max": None,
+        }
+        self._cancel_profile_save: CALLBACK_TYPE | None = None
+        self.wake_stats: dict[str, int] = {
+            "wakes": 0,
+            "skips": 0,
+            "probes": 0,
+            "probe_failures": 0,
+            "acked": 0,
+        }
+
+        # Менеджер з'єднання: idle-таймаут та передбачуване підключення
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
+        # З'єднання, залишене майстром налаштування, до першого підключення
+        self._handoff: ConnectionHandoff | None = None
+        # Запуск: сутності з'являються одразу, BLE піднімається у фоні
+        self._created = monotonic()
+        self.startup_stats: dict[str, Any] = {
+            "entities_available": None,
+            "first_connected": None,
+            "bringup": "pending",
+            "bringup_error": None,
+        }
+        self._usage = PTBabyUsageHistory()
+        self._idle_timeout: int = DEFAULT_IDLE_TIMEOUT
+        # Опції, застосовані останніми: оновлення data їх не змінює
+        self.applied_options: dict[str, Any] | None = None
+        self._preconnect_enabled: bool = DEFAULT_PRECONNECT
+        self._cancel_idle: CALLBACK_TYPE | None = None
+        self._cancel_preconnect: CALLBACK_TYPE | None = None
+        self._cancel_reconnect: CALLBACK_TYPE | None = None
+        self._preconnect_window: datetime | None = None
+        self._preconnected = False
+        self._expected_disconnect = False
+        self.connection_stats: dict[str, Any] = {
+            "connects": 0,
+            "reconnects": 0,
+            "evictions": 0,
+            "link_losses": 0,
+            "write_retries": 0,
+            "write_recoveries": 0,
+            "connect_failures": 0,
+            "fast_failures": 0,
+            "last_connect_duration": None,
+            "warm_commands": 0,
+            "cold_commands": 0,
+            "idle_disconnects": 0,
+            "preconnects": 0,
+            "preconnect_failures": 0,
+            "preconnect_hits": 0,
+            "preconnect_misses": 0,
+        }
 
         # Стан
         self._is_on = False
@@ -58,67 +686,814 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         self._timer = 0
         self._induction_mode = False
 
+        # Без опитування: стан приходить через notify
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),
         )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Повертаємо поточний стан."""
-        return {
-            "is_on": self._is_on,
-            "swing_speed": self._swing_speed,
-            "melody_on": self._melody_on,
-            "current_melody": self._current_melody,
-            "volume": self._volume,
-            "timer": self._timer,
-            "induction_mode": self._induction_mode,
+        return self._build_data()
+
+    @callback
+    def _device_state(self) -> dict[str, Any]:
+        """Last known device state, without pending requests."""
+        return {key: getattr(self, attr) for key, attr in _STATE_ATTRS.items()}
+
+    @callback
+    def _build_data(self) -> dict[str, Any]:
+        """Snapshot of the tracked state with pending requests shown on top."""
+        data = self._device_state()
+        data.update({key: value for key, (value, _owner) in self._pending_state.items()})
+        data["pending"] = sorted(self._pending_state)
+        data["restored"] = sorted(self._restored)
+        return data
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, Any]) -> None:
+        """Push data to entities and persist the device state if it changed."""
+        super().async_set_updated_data(data)
+        state = self._device_state()
+        if state != self._saved_state:
+            self._saved_state = state
+            self._store.async_delay_save(self._data_to_store, STATE_SAVE_DELAY)
+
+    @callback
+    def _confirm_restored(self, keys: Any) -> bool:
+        """Stop marking ``keys`` as restored; return True if any were."""
+        if not self._restored or not (confirmed := self._restored.intersection(keys)):
+            return False
+        self._restored -= confirmed
+        return True
+
+    @callback
+    def _set_pending(self, target: dict[str, Any]) -> int | None:
+        """Show a requested state right away, until its command settles."""
+        if not target:
+            return None
+        owner = next(self._pending_ids)
+        for key, value in target.items():
+            self._pending_state[key] = (value, owner)
+        self.async_set_updated_data(self._build_data())
+        return owner
+
+    @callback
+    def _drop_pending(self, owner: int | None) -> dict[str, Any]:
+        """Forget what one command still has pending; return it."""
+        dropped = {
+            key: value
+            for key, (value, pending_owner) in self._pending_state.items()
+            if pending_owner == owner
         }
+        for key in dropped:
+            del self._pending_state[key]
+        return dropped
+
+    @callback
+    def _settle_pending(self, owner: int | None) -> None:
+        if self._drop_pending(owner):
+            self.async_set_updated_data(self._build_data())
+
+    @callback
+    def _rollback_pending(self, owner: int | None, command: str, err: Exception) -> None:
+        """Return entities to the device state and tell automations why."""
+        if not (dropped := self._drop_pending(owner)):
+            return
+        _LOGGER.debug("Rolling back %s after failed %s", dropped, command)
+        self.hass.bus.async_fire(
+            EVENT_STATE_ROLLBACK,
+            {
+                "address": self.address,
+                "command": command,
+                "requested": dropped,
+                "state": {key: getattr(self, _STATE_ATTRS[key]) for key in dropped},
+                "error": str(err),
+            },
+        )
+        self.async_set_updated_data(self._build_data())
+
+    @callback
+    def _confirm_pending(self, state: dict[str, Any]) -> bool:
+        """Clear pending values the device has just reported."""
+        confirmed = [
+            key
+            for key, value in state.items()
+            if key in self._pending_state and self._pending_state[key][0] == value
+        ]
+        for key in confirmed:
+            del self._pending_state[key]
+        return bool(confirmed)
+
+    @callback
+    def _apply_state(self, updates: dict[str, Any]) -> bool:
+        """Apply decoded state; return True if anything changed."""
+        changed = False
+        for key, value in updates.items():
+            attr = _STATE_ATTRS.get(key)
+            if attr and getattr(self, attr) != value:
+                setattr(self, attr, value)
+                changed = True
+        return changed
 
     async def _ensure_connected(self) -> None:
         """Гарантує підключення з агресивним пошуком."""
         if self._client and self._client.is_connected:
             return
+        if self._handoff is not None and await self._async_adopt_handoff():
+            return
+        self._check_circuit()
+
+        started = monotonic()
+        candidates = self._async_connect_candidates()
+        lookup = monotonic() - started
+        self.metrics.record(METRIC_LOOKUP, lookup)
+        self.tracer.record("lookup", lookup, candidates=len(candidates))
+        if not candidates:
+            raise UpdateFailed(f"Device {self.address} not found via Bluetooth scan. Check range or power.")
+
+        _LOGGER.debug("Connecting to %s...", self.address)
+        started = monotonic()
+        try:
+            await self._async_connect_path(candidates)
+            if not await self._async_resolve_characteristics():
+                # Кеш сервісів застарів: скидаємо його і шукаємо сервіси заново
+                _LOGGER.debug("Service cache of %s is stale, rediscovering", self.address)
+                self.gatt_stats["rediscoveries"] += 1
+                with self.tracer.span("rediscover"):
+                    source = self._slot_source
+                    await self._client.clear_cache()
+                    self._expected_disconnect = True
+                    await self._client.disconnect()
+                    await self._async_acquire_slot(source)
+                    self._client = await self._async_establish(use_services_cache=False)
+                    self._async_rekey_slot()
+                    self._path = self._path_stats(self._slot_source)
+                if not await self._async_resolve_characteristics():
+                    raise UpdateFailed(
+                        f"Write characteristic {self.write_char_uuid} not found"
+                    )
+            _LOGGER.info("Connected to PT Baby Swing at %s", self.address)
+            with self.tracer.span("start_notify"):
+                await self._maybe_start_notify()
+        except asyncio.CancelledError:
+            # Дедлайн команди посеред підключення: недоналаштований лінк
+            # не лишаємо, щоб наступна команда підключилась начисто
+            if self._client:
+                self._expected_disconnect = True
+                self.entry.async_create_background_task(
+                    self.hass, self._client.disconnect(), f"{DOMAIN}_drop_{self.address}"
+                )
+            self._client = None
+            self._release_slot()
+            raise
+        except Exception as err:
+            self._client = None
+            self._release_slot()
+            self.connection_stats["connect_failures"] += 1
+            self._record_connect_failure()
+            raise UpdateFailed(f"Connection failed: {err}") from err
+
+        if self.breaker.record_success():
+            _LOGGER.info("%s is reachable again", self.address)
+            self.async_update_listeners()
+        duration = monotonic() - started
+        self.metrics.record(METRIC_CONNECT, duration)
+        self.tracer.record("connect", duration)
+        self.connection_stats["connects"] += 1
+        if self._last_link is not None:
+            self.connection_stats["reconnects"] += 1
+        self.connection_stats["last_connect_duration"] = round(duration, 3)
+        self._mark_connected()
+
+    @callback
+    def _mark_connected(self) -> None:
+        if self.startup_stats["first_connected"] is None:
+            self.startup_stats["first_connected"] = round(monotonic() - self._created, 3)
+
+    @callback
+    def _check_circuit(self) -> None:
+        """Fail instantly while the circuit is open."""
+        if self._client and self._client.is_connected:
+            return
+        if self.breaker.allow(monotonic()):
+            return
+        self.connection_stats["fast_failures"] += 1
+        raise UpdateFailed(
+            f"Device {self.address} is unreachable, next attempt in "
+            f"{self.breaker.retry_at - monotonic():.0f}s"
+        )
+
+    @callback
+    def _record_connect_failure(self) -> None:
+        if not self.breaker.record_failure(monotonic()):
+            return
+        _LOGGER.warning(
+            "%s is unreachable after %s attempts, pausing connects for %.0fs",
+            self.address,
+            self.breaker.failures,
+            self.breaker.backoff,
+        )
+        if self._cancel_half_open:
+            self._cancel_half_open()
+        self._cancel_half_open = async_call_later(
+            self.hass, self.breaker.retry_at - monotonic(), self._handle_backoff_expired
+        )
+        self.async_update_listeners()
+
+    @callback
+    def _handle_backoff_expired(self, _now: datetime) -> None:
+        self._cancel_half_open = None
+        self._async_half_open("backoff expired")
+
+    @callback
+    def _async_half_open(self, reason: str) -> None:
+        """Let the next connect through as a trial."""
+        if not self.breaker.half_open():
+            return
+        _LOGGER.debug("Circuit of %s half-open (%s)", self.address, reason)
+        if self._cancel_half_open:
+            self._cancel_half_open()
+            self._cancel_half_open = None
+        self.async_update_listeners()
+        if self._idle_timeout == 0:
+            self._handle_keepalive(None)
+
+    @callback
+    def _path_stats(self, source: str | None) -> PTBabyPathStats:
+        source = source or "unknown"
+        if (path := self._paths.get(source)) is None:
+            path = self._paths[source] = PTBabyPathStats(source)
+        return path
+
+    @callback
+    def _async_connect_candidates(self) -> list[tuple[PTBabyPathStats, BLEDevice]]:
+        """Connectable paths to the device, strongest signal first.
+
+        That is the order the bluetooth stack tries them in, so the first
+        one is the best guess of the path a connect will go through.
+        """
+        fallback = self._async_find_device()
+        candidates: list[tuple[PTBabyPathStats, BLEDevice]] = []
+        for scanner_device in bluetooth.async_scanner_devices_by_address(
+            self.hass, self.address, connectable=True
+        ):
+            path = self._path_stats(scanner_device.scanner.source)
+            path.rssi = scanner_device.advertisement.rssi
+            candidates.append((path, scanner_device.ble_device))
+        if not candidates and fallback is not None:
+            details = getattr(fallback, "details", None)
+            details = details if isinstance(details, dict) else {}
+            candidates.append((self._path_stats(details.get("source")), fallback))
+        candidates.sort(
+            key=lambda candidate: (
+                candidate[0].rssi is None,
+                -(candidate[0].rssi or 0),
+            )
+        )
+        return candidates
+
+    async def _async_connect_path(
+        self, candidates: list[tuple[PTBabyPathStats, BLEDevice]]
+    ) -> None:
+        """Connect and credit the path the established client went through.
+
+        Inside Home Assistant the bluetooth wrapper picks the adapter or
+        proxy by itself, whatever device is passed in, so the candidate is
+        only a guess; the stats go to the source the client reports.
+        """
+        guess, device = candidates[0]
+        self._device = device
+        await self._async_acquire_slot(guess.source)
+        # Пробне підключення: одна спроба, щоб швидко дізнатися результат
+        max_attempts = 1 if self.breaker.state == CIRCUIT_HALF_OPEN else 3
+        started = monotonic()
+        try:
+            with self.tracer.span("establish_connection", source=guess.source):
+                self._client = await self._async_establish(
+                    use_services_cache=True, max_attempts=max_attempts
+                )
+        except Exception:
+            self._release_slot()
+            # Невдалий клієнт не каже, куди підключався: вину знаємо,
+            # лише коли шлях один
+            if len(candidates) == 1:
+                guess.record_connect(None)
+            raise
+        self._async_rekey_slot()
+        path = self._path_stats(self._slot_source)
+        path.record_connect(monotonic() - started)
+        self._path = path
+
+    @callback
+    def _client_source(self) -> str | None:
+        """Source of the adapter or proxy the client actually connected through."""
+        scanner = getattr(self._client, "_connected_scanner", None)
+        return getattr(scanner, "source", None)
+
+    @callback
+    def _async_rekey_slot(self) -> None:
+        """Move the slot taken on the guessed source to the one really used."""
+        source = self._client_source()
+        if not self._has_slot or source is None or source == self._slot_source:
+            return
+        _LOGGER.debug(
+            "%s connected via %s, not %s", self.address, source, self._slot_source
+        )
+        self._slots.move(self._slot_source, source, self)
+        self._slot_source = source
+
+    async def _async_acquire_slot(self, source: str | None) -> None:
+        """Wait for this adapter to have room for one more connection."""
+        if self._has_slot and self._slot_source != source:
+            self._release_slot()
+        with self.tracer.span("slot_wait", source=source):
+            waited = await self._slots.async_acquire(source, self)
+        self._slot_source = source
+        self._has_slot = True
+        self.metrics.record(METRIC_SLOT_WAIT, waited)
+        if waited:
+            _LOGGER.debug("Waited %.2fs for a connection slot on %s", waited, source)
+
+    @callback
+    def _release_slot(self) -> None:
+        if self._has_slot:
+            self._has_slot = False
+            self._slots.release(self._slot_source, self)
+
+    @property
+    def link_busy(self) -> bool:
+        """True while a command holds the link."""
+        return self._link_lock.locked()
+
+    @callback
+    def async_yield_slot(self) -> None:
+        """Hand the connection slot to a waiting cradle once idle."""
+        if self._has_slot:
+            self._slots.async_yield(self._slot_source, self)
+
+    async def async_evict_slot(self) -> None:
+        """Disconnect while idle so another cradle can use the slot."""
+        async with self._link_lock:
+            if self._client and self._client.is_connected:
+                self.connection_stats["evictions"] += 1
+                _LOGGER.debug("Yielding connection slot of %s", self.address)
+                self._expected_disconnect = True
+                await self._client.disconnect()
+            self._release_slot()
+
+    @callback
+    def _async_find_device(self) -> BLEDevice | None:
+        """Pick the device to connect to, failing fast if it is gone."""
+        now = monotonic()
+        presence = self.presence
+        if presence.last_seen is not None:
+            seen = max(presence.last_seen, self._last_link or 0)
+            if not presence.available or now - seen > PRESENCE_GONE_AFTER:
+                raise UpdateFailed(
+                    f"Device {self.address} is out of range (last seen {now - seen:.0f}s ago)"
+                )
+            if presence.device is not None:
+                return presence.device
 
         # Спроба 1: Шукаємо "хороший" пристрій (connectable=True)
-        self._device = bluetooth.async_ble_device_from_address(
+        device = bluetooth.async_ble_device_from_address(
             self.hass, self.address, connectable=True
         )
 
         # Спроба 2: Якщо не знайшли, шукаємо будь-який (connectable=False)
-        if not self._device:
+        if not device:
             _LOGGER.debug("Device not found as connectable, trying non-connectable scan...")
-            self._device = bluetooth.async_ble_device_from_address(
+            device = bluetooth.async_ble_device_from_address(
                 self.hass, self.address, connectable=False
             )
+        return device
 
-        if not self._device:
-            raise UpdateFailed(f"Device {self.address} not found via Bluetooth scan. Check range or power.")
+    @callback
+    def _async_start_presence(self) -> None:
+        """Follow advertisements of the device until the entry unloads.
 
-        _LOGGER.debug("Connecting to %s...", self.address)
+        The entry's unload callbacks also run when setup fails afterwards,
+        so the subscriptions do not outlive a failed setup.
+        """
+        if service_info := bluetooth.async_last_service_info(
+            self.hass, self.address, connectable=False
+        ):
+            self.presence.update(service_info, monotonic())
+        self._presence_unsubs = [
+            bluetooth.async_register_callback(
+                self.hass,
+                self._async_handle_advertisement,
+                bluetooth.BluetoothCallbackMatcher(address=self.address, connectable=False),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            ),
+            bluetooth.async_track_unavailable(
+                self.hass, self._async_handle_unavailable, self.address, connectable=False
+            ),
+        ]
+        self.entry.async_on_unload(self._async_stop_presence)
+
+    @callback
+    def _async_stop_presence(self) -> None:
+        while self._presence_unsubs:
+            self._presence_unsubs.pop()()
+
+    @callback
+    def _async_handle_advertisement(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        returned = not self.presence.available
+        self.presence.update(service_info, monotonic())
+        if self.startup_stats["bringup"] == "waiting":
+            # Під час запуску пристрій ще не рекламувався: підключаємось зараз
+            self._async_schedule_bringup()
+        if not returned:
+            return
+        if self.breaker.state == CIRCUIT_OPEN:
+            # Пристрій повернувся: пробуємо, не чекаючи кінця паузи
+            self._async_half_open("advertisement")
+            return
+
+        _LOGGER.debug("%s is back in range via %s", self.address, service_info.source)
+        self.async_update_listeners()
+        if self._idle_timeout == 0 or self._queue or (
+            self._preconnect_enabled and self._usage.is_active(dt_util.now())
+        ):
+            self._handle_keepalive(None)
+
+    @callback
+    def _async_handle_unavailable(self, service_info: bluetooth.BluetoothServiceInfoBleak) -> None:
+        if self._client and self._client.is_connected:
+            # Під час з'єднання пристрій зазвичай не рекламується
+            return
+        _LOGGER.debug("%s is out of range", self.address)
+        self.presence.available = False
+        self.async_update_listeners()
+
+    @property
+    def device_available(self) -> bool:
+        """Whether the device is connected, or advertising and not known unreachable."""
+        if self._client and self._client.is_connected:
+            return True
+        return self.presence.available and self.breaker.state != CIRCUIT_OPEN
+
+    async def _async_establish(
+        self, *, use_services_cache: bool, max_attempts: int = 3
+    ) -> BleakClientWithServiceCache:
+        return await establish_connection(
+            BleakClientWithServiceCache,
+            self._device,
+            name=self.address,
+            disconnected_callback=self._on_disconnected,
+            use_services_cache=use_services_cache,
+            max_attempts=max_attempts
+        )
+
+    async def _async_resolve_characteristics(self) -> bool:
+        """Resolve write/notify characteristics once per link, by cached handle.
+
+        Returns False if the write characteristic is missing from the live
+        service table, which means the backend cache is stale.
+        """
+        services = self._client.services
+        table = self._gatt_table
+        write_char = resolve_cached(
+            services, find_handle(table, self.write_char_uuid), self.write_char_uuid
+        )
+        notify_char = resolve_cached(
+            services, find_handle(table, self.notify_char_uuid), self.notify_char_uuid
+        )
+
+        if write_char and (notify_char or not self.notify_char_uuid):
+            self.gatt_stats["cache_hits"] += 1
+        else:
+            self.gatt_stats["cache_misses" if table is None else "invalidations"] += 1
+            write_char = self._lookup_characteristic(self.write_char_uuid)
+            notify_char = self._lookup_characteristic(self.notify_char_uuid)
+            if write_char is None:
+                return False
+            self._gatt_table = serialize_services(services)
+            self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+        self._write_char = write_char
+        self._notify_char = notify_char
+        return True
+
+    def _lookup_characteristic(self, uuid: str | None) -> BleakGATTCharacteristic | None:
+        if not uuid or not self._client:
+            return None
         try:
-            self._client = await establish_connection(
-                BleakClientWithServiceCache,
-                self._device,
-                name=self.address,
-                disconnected_callback=self._on_disconnected,
-                use_services_cache=True,
-                max_attempts=3
-            )
-            _LOGGER.info("Connected to PT Baby Swing at %s", self.address)
-            await self._maybe_start_notify()
-        except Exception as err:
-            self._client = None
-            raise UpdateFailed(f"Connection failed: {err}") from err
+            return self._client.services.get_characteristic(uuid)
+        except BleakError:
+            return None
 
     def _on_disconnected(self, client):
         """Callback при розриві з'єднання."""
-        _LOGGER.info("Disconnected from PT Baby Swing")
+        if self._client is not None and client is not self._client:
+            # Запізнілий callback від попереднього клієнта
+            return
+        if self._client is not None:
+            self._release_slot()
         self._client = None
+        self._path = None
+        self._last_link = monotonic()
+        self._write_char = None
+        self._notify_char = None
+        self._notify_started = False
+        self._preconnected = False
+        self._cancel_idle_timer()
+        if self._expected_disconnect:
+            # Свідоме відключення (idle): стан пристрою не змінився
+            self._expected_disconnect = False
+            _LOGGER.debug("Idle disconnect from %s", self.address)
+            return
+
+        _LOGGER.info("Disconnected from PT Baby Swing")
+        self.confidence.forget()
         self._is_on = False
-        self.async_set_updated_data(self.data)
+        self.async_set_updated_data(self._build_data())
+        if self._idle_timeout == 0:
+            self._cancel_reconnect = async_call_later(
+                self.hass, RECONNECT_DELAY, self._handle_keepalive
+            )
+
+    # --- МЕНЕДЖЕР З'ЄДНАННЯ ---
+
+    async def async_load(self) -> None:
+        """Load usage history and options before the first refresh.
+
+        Nothing here talks to the device; the config flow's connection is
+        only claimed and gets adopted by the first connect.
+        """
+        stored = await self._store.async_load() or {}
+        self._usage = PTBabyUsageHistory.from_dict(stored.get("usage"))
+        self._gatt_table = stored.get("gatt")
+        # Останній відомий стан: показуємо одразу, поки пристрій не підтвердить
+        state = {
+            key: value
+            for key, value in (stored.get("state") or {}).items()
+            if key in _STATE_ATTRS
+        }
+        self._apply_state(state)
+        self._restored = set(state)
+        self._saved_state = self._device_state()
+        self._handoff = async_claim(self.hass, self.address)
+        self._async_start_presence()
+        self.async_apply_options()
+
+    @callback
+    def async_start(self) -> None:
+        """Note that entities are up and bring the link up in the background."""
+        self.startup_stats["entities_available"] = round(monotonic() - self._created, 3)
+        self._async_schedule_bringup()
+
+    @callback
+    def _async_schedule_bringup(self) -> None:
+        self.startup_stats["bringup"] = "pending"
+        self.entry.async_create_background_task(
+            self.hass, self._async_bringup(), f"{DOMAIN}_bringup_{self.address}"
+        )
+
+    async def _async_bringup(self) -> None:
+        """Connect, validate GATT and subscribe so the first command is warm."""
+        async with self._link_lock:
+            try:
+                await self._ensure_connected()
+            except UpdateFailed as err:
+                # Сканер міг ще не побачити пристрій: чекаємо першої реклами
+                waiting = self.presence.last_seen is None or not self.presence.available
+                self.startup_stats["bringup"] = "waiting" if waiting else "failed"
+                self.startup_stats["bringup_error"] = str(err)
+                _LOGGER.debug("Initial connect to %s failed: %s", self.address, err)
+                return
+            self.startup_stats["bringup"] = "connected"
+            self.startup_stats["bringup_error"] = None
+            self._arm_idle_timer()
+
+    async def _async_adopt_handoff(self) -> bool:
+        """Take over the connection left open by the config flow."""
+        handoff, self._handoff = self._handoff, None
+        if handoff is None or not handoff.is_connected:
+            return False
+        handoff.on_disconnect = self._on_disconnected
+        self._client = handoff.client
+        self._gatt_table = handoff.table
+        if not await self._async_resolve_characteristics():
+            _LOGGER.debug("Handed-off connection to %s lacks write characteristic", self.address)
+            self._expected_disconnect = True
+            await handoff.async_disconnect()
+            self._client = None
+            return False
+        self.gatt_stats["handoffs"] += 1
+        # З'єднання вже займає слот адаптера, через який його відкрили
+        source = self._client_source()
+        if source is None:
+            device = bluetooth.async_ble_device_from_address(
+                self.hass, self.address, connectable=True
+            )
+            details = getattr(device, "details", None)
+            source = details.get("source") if isinstance(details, dict) else None
+        self._slot_source = source
+        self._slots.claim(self._slot_source, self)
+        self._has_slot = True
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        await self._maybe_start_notify()
+        self._mark_connected()
+        _LOGGER.debug("Adopted config flow connection to %s", self.address)
+        return True
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply options from the config entry without reloading."""
+        options = self.entry.options
+        self.applied_options = dict(options)
+        self._idle_timeout = int(options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT))
+        self._preconnect_enabled = bool(options.get(CONF_PRECONNECT, DEFAULT_PRECONNECT))
+        self.tracer.enabled = bool(options.get(CONF_TRACE, DEFAULT_TRACE))
+        self._schedule_preconnect()
+        if self._cancel_reconnect and self._idle_timeout != 0:
+            self._cancel_reconnect()
+            self._cancel_reconnect = None
+        if self._client and self._client.is_connected:
+            self._arm_idle_timer()
+        elif self._idle_timeout == 0:
+            self._handle_keepalive(None)
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        return {
+            "usage": self._usage.as_dict(),
+            "gatt": self._gatt_table,
+            "state": self._device_state(),
+        }
+
+    @callback
+    def _record_usage(self) -> None:
+        """Remember when commands are sent to learn the daily routine."""
+        self._usage.record(dt_util.now())
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+        self._schedule_preconnect()
+
+    @callback
+    def _cancel_idle_timer(self) -> None:
+        if self._cancel_idle:
+            self._cancel_idle()
+            self._cancel_idle = None
+
+    @callback
+    def _arm_idle_timer(self) -> None:
+        """(Re)start the countdown after which the link is dropped."""
+        self._cancel_idle_timer()
+        if self._idle_timeout == 0:
+            return
+        self._cancel_idle = async_call_later(
+            self.hass, self._idle_timeout, self._handle_idle_timeout
+        )
+
+    @callback
+    def _handle_idle_timeout(self, _now: datetime) -> None:
+        self._cancel_idle = None
+        self.entry.async_create_background_task(
+            self.hass, self._async_idle_disconnect(), f"{DOMAIN}_idle_{self.address}"
+        )
+
+    async def _async_idle_disconnect(self) -> None:
+        """Drop the link to free an adapter slot unless usage is expected."""
+        async with self._link_lock:
+            if not self._client or not self._client.is_connected:
+                return
+            if self._preconnect_enabled and self._usage.is_active(dt_util.now()):
+                _LOGGER.debug("Keeping %s connected inside usage window", self.address)
+                self._arm_idle_timer()
+                return
+
+            self.connection_stats["idle_disconnects"] += 1
+            if self._preconnected:
+                self.connection_stats["preconnect_misses"] += 1
+            _LOGGER.debug("Idle for %ss, disconnecting %s", self._idle_timeout, self.address)
+            self._expected_disconnect = True
+            await self._client.disconnect()
+
+    @callback
+    def _handle_keepalive(self, _now: datetime | None) -> None:
+        """Connect in the background when the link must stay up."""
+        self._cancel_reconnect = None
+        self.entry.async_create_background_task(
+            self.hass, self._async_keepalive(), f"{DOMAIN}_keepalive_{self.address}"
+        )
+
+    async def _async_keepalive(self) -> None:
+        if self._client and self._client.is_connected:
+            return
+        async with self._link_lock:
+            try:
+                await self._ensure_connected()
+            except UpdateFailed as err:
+                _LOGGER.debug("Keep-alive connect to %s failed: %s", self.address, err)
+                if (
+                    not self.presence.available
+                    or self._idle_timeout != 0
+                    or self.breaker.state == CIRCUIT_OPEN
+                ):
+                    # Підключимося, коли пристрій з'явиться або мине пауза
+                    return
+                self._cancel_reconnect = async_call_later(
+                    self.hass, RECONNECT_DELAY, self._handle_keepalive
+                )
+
+    @callback
+    def _schedule_preconnect(self, after: datetime | None = None) -> None:
+        """Plan a background connect just before the next predicted window."""
+        if self._cancel_preconnect:
+            self._cancel_preconnect()
+            self._cancel_preconnect = None
+        self._preconnect_window = None
+        if not self._preconnect_enabled:
+            return
+
+        now = dt_util.now()
+        window = self._usage.next_window(after or now)
+        if window is None:
+            return
+        self._preconnect_window = window
+        when = max(window - timedelta(seconds=PRECONNECT_LEAD), now + timedelta(seconds=1))
+        self._cancel_preconnect = async_track_point_in_time(
+            self.hass, self._handle_preconnect, when
+        )
+
+    @callback
+    def _handle_preconnect(self, _now: datetime) -> None:
+        self._cancel_preconnect = None
+        self.entry.async_create_background_task(
+            self.hass, self._async_preconnect(), f"{DOMAIN}_preconnect_{self.address}"
+        )
+
+    async def _async_preconnect(self) -> None:
+        """Connect ahead of a predicted command."""
+        window = self._preconnect_window
+        try:
+            if self._client and self._client.is_connected:
+                return
+            async with self._link_lock:
+                try:
+                    await self._ensure_connected()
+                except UpdateFailed as err:
+                    self.connection_stats["preconnect_failures"] += 1
+                    _LOGGER.debug("Pre-connect to %s failed: %s", self.address, err)
+                    return
+                self.connection_stats["preconnects"] += 1
+                self._preconnected = True
+                self._arm_idle_timer()
+                _LOGGER.debug("Pre-connected to %s ahead of %s", self.address, window)
+        finally:
+            # Наступне вікно шукаємо після поточного
+            if window is not None and self._cancel_preconnect is None:
+                self._schedule_preconnect(window)
+
+    @callback
+    def connection_diagnostics(self) -> dict[str, Any]:
+        """Return connection manager state for diagnostics."""
+        stats = self.connection_stats
+        commands = stats["warm_commands"] + stats["cold_commands"]
+        preconnect_total = stats["preconnect_hits"] + stats["preconnect_misses"]
+        return {
+            **stats,
+            "connected": bool(self._client and self._client.is_connected),
+            "idle_timeout": self._idle_timeout,
+            "preconnect_enabled": self._preconnect_enabled,
+            "next_preconnect_window": (
+                self._preconnect_window.isoformat() if self._preconnect_window else None
+            ),
+            "warm_hit_rate": round(stats["warm_commands"] / commands, 3) if commands else None,
+            "preconnect_hit_rate": (
+                round(stats["preconnect_hits"] / preconnect_total, 3)
+                if preconnect_total
+                else None
+            ),
+            "startup": dict(self.startup_stats),
+            "presence": self.presence.as_dict(monotonic()),
+            "state_confidence": self.confidence.as_dict(monotonic()),
+            "circuit": self.breaker.as_dict(monotonic()),
+            "slots": self._slots.as_dict(self),
+            "paths": {
+                source: {**path.as_dict(), "active": path is self._path}
+                for source, path in self._paths.items()
+            },
+            "queue": {**self.queue_stats, "pending": list(self._queue)},
+            "entities": dict(self.entity_stats),
+            "wake": {**self.wake_stats, "profile": self._wake_profile.as_dict()},
+            "acks": {**self.ack_stats, "timeout": round(self._ack_timeout, 3)},
+            "gatt": {
+                **self.gatt_stats,
+                "write_handle": self._write_char.handle if self._write_char else None,
+                "notify_handle": self._notify_char.handle if self._notify_char else None,
+                "cached_services": len(self._gatt_table or ()),
+            },
+            "usage": self._usage.as_dict(),
+        }
 
     async def _maybe_start_notify(self) -> None:
         """Start notify stream if characteristic is known."""
@@ -127,7 +1502,7 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
         try:
             await self._client.start_notify(
-                self.notify_char_uuid, self._handle_notification
+                self._notify_char or self.notify_char_uuid, self._handle_notification
             )
             self._notify_started = True
             _LOGGER.debug(
@@ -139,9 +1514,19 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             # Не блокуюча помилка: повідомляємо, але продовжуємо роботу
             _LOGGER.debug("Notify unavailable on %s: %s", self.notify_char_uuid, err)
 
-    def _handle_notification(self, sender: int, data: bytearray) -> None:
-        """Log incoming notifications for debugging."""
+    @callback
+    def _handle_notification(self, sender: Any, data: bytearray) -> None:
+        """Decode a notify frame and push changed state to entities."""
         _LOGGER.debug("Notification from %s: %s", sender, data.hex())
+        self._last_activity = monotonic()
+        decoded = decode_notification(data)
+        if decoded.commands:
+            self._resolve_acks(decoded.commands, self._last_activity)
+        self.confidence.confirm(decoded.state, self._last_activity)
+        confirmed = self._confirm_pending(decoded.state)
+        confirmed = self._confirm_restored(decoded.state) or confirmed
+        if (decoded.state and self._apply_state(decoded.state)) or confirmed:
+            self.async_set_updated_data(self._build_data())
 
     async def _write_command(self, command: str) -> None:
         """Low-level write helper."""
@@ -151,64 +1536,651 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             raise UpdateFailed("Write characteristic UUID is missing")
 
         cmd_bytes = command.encode("utf-8")
-        await self._client.write_gatt_char(
-            self.write_char_uuid,
-            cmd_bytes,
-            response=False,
-        )
+        failed_at: float | None = None
+        for attempt in range(WRITE_RETRIES + 1):
+            started = monotonic()
+            try:
+                with self.tracer.span("write", command=command, attempt=attempt):
+                    await self._client.write_gatt_char(
+                        self._write_char or self.write_char_uuid,
+                        cmd_bytes,
+                        response=False,
+                    )
+                break
+            except Exception as err:
+                if self._path:
+                    self._path.record_write(False)
+                connected = bool(self._client and self._client.is_connected)
+                if attempt == WRITE_RETRIES or classify_error(err, connected) != ERROR_TRANSIENT:
+                    raise
+                # Тимчасова помилка GATT: повторюємо на тому ж з'єднанні
+                failed_at = failed_at or started
+                self.connection_stats["write_retries"] += 1
+                _LOGGER.debug("Transient write error for %s (%s), retrying", command, err)
+                await asyncio.sleep(WRITE_RETRY_DELAY * 2**attempt)
+        if self._path:
+            self._path.record_write(True)
+        self._last_activity = monotonic()
+        self.metrics.record(METRIC_WRITE, self._last_activity - started)
+        if failed_at is not None:
+            self.connection_stats["write_recoveries"] += 1
+            self.metrics.record(METRIC_WRITE_RETRY, self._last_activity - failed_at)
         _LOGGER.info("Sent command: %s", command)
 
-    async def _wake_device(self) -> None:
-        """Send wake-up before other commands."""
-        # throttle wake-ups a little to avoid spamming
+    # --- ПІДТВЕРДЖЕННЯ (ACK) ---
+
+    @property
+    def _acks_usable(self) -> bool:
+        return self._notify_started and self._wake_profile.acks is not False
+
+    @property
+    def _ack_timeout(self) -> float:
+        rtt = self.ack_stats["rtt_avg"]
+        if rtt is None:
+            return ACK_TIMEOUT
+        return min(ACK_TIMEOUT, max(rtt * 3, ACK_MIN_TIMEOUT))
+
+    @callback
+    def _expect_ack(self, command: str) -> asyncio.Future[float]:
+        """Register a future resolved by the echo of ``command``."""
+        future: asyncio.Future[float] = self.hass.loop.create_future()
+        self._pending_acks.setdefault(command, []).append(future)
+        return future
+
+    @callback
+    def _discard_ack(self, command: str, future: asyncio.Future[float]) -> None:
+        waiters = self._pending_acks.get(command)
+        if waiters and future in waiters:
+            waiters.remove(future)
+        if not waiters:
+            self._pending_acks.pop(command, None)
+
+    @callback
+    def _resolve_acks(self, commands: list[str], arrived: float) -> None:
+        """Resolve the oldest outstanding write of each echoed command."""
+        for command in commands:
+            for future in self._pending_acks.get(command, ()):
+                if not future.done():
+                    future.set_result(arrived)
+                    break
+
+    @callback
+    def _record_ack(self, rtt: float) -> None:
+        stats = self.ack_stats
+        stats["acked"] += 1
+        stats["rtt_last"] = round(rtt, 4)
+        avg = stats["rtt_avg"]
+        stats["rtt_avg"] = round(rtt if avg is None else avg + ACK_RTT_ALPHA * (rtt - avg), 4)
+        stats["rtt_min"] = min(stats["rtt_min"] or rtt, stats["rtt_last"])
+        stats["rtt_max"] = max(stats["rtt_max"] or rtt, stats["rtt_last"])
+        self._ack_misses = 0
+        if not self._wake_profile.acks:
+            self._wake_profile.acks = True
+            self._schedule_profile_save()
+
+    @callback
+    def _record_ack_miss(self) -> None:
+        self.ack_stats["lost"] += 1
+        self._ack_misses += 1
+        if self._wake_profile.acks is None and self._ack_misses >= ACK_MAX_MISSES:
+            _LOGGER.debug("No command echo from %s, acknowledgements disabled", self.address)
+            self._wake_profile.acks = False
+            self._schedule_profile_save()
+
+    async def _async_write_acked(
+        self,
+        command: str,
+        *,
+        retries: int = ACK_RETRIES,
+        timeout: float | None = None,
+    ) -> float | None:
+        """Write a command and wait for its echo, retransmitting lost ones.
+
+        Returns the round trip time, or None if the device does not echo.
+        Raises UpdateFailed when an echoing device never confirmed.
+        """
+        if not self._acks_usable:
+            await self._write_command(command)
+            return None
+
+        if self._wake_profile.acks is None:
+            # Поки невідомо, чи є ехо, не дублюємо команди
+            retries = 0
+        timeout = timeout or self._ack_timeout
+
+        for attempt in range(retries + 1):
+            if attempt:
+                self.ack_stats["retransmits"] += 1
+                _LOGGER.debug("No echo for %s, retransmitting (%s)", command, attempt)
+            future = self._expect_ack(command)
+            started = monotonic()
+            try:
+                await self._write_command(command)
+                with self.tracer.span("ack_wait", command=command, attempt=attempt):
+                    arrived = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                self._discard_ack(command, future)
+            rtt = arrived - started
+            self._record_ack(rtt)
+            return rtt
+
+        self._record_ack_miss()
+        if self._wake_profile.acks:
+            raise UpdateFailed(f"Command {command} was not acknowledged")
+        return None
+
+    async def _wake_device(
+        self, *, force: bool = False, urgent: bool = False
+    ) -> float | None:
+        """Wake the device unless it is known to be awake.
+
+        Returns the idle gap when the wake was skipped on a guess that the
+        caller must verify, otherwise None. ``urgent`` commands probe for
+        any gap the device was not already seen sleeping after.
+        """
+        profile = self._wake_profile
         now = monotonic()
-        if self._last_wake and now - self._last_wake < 2:
-            _LOGGER.debug("Wake skipped (recent wake %.2fs ago)", now - self._last_wake)
-            return
+        gap = now - self._last_activity if self._last_activity is not None else None
+        if not force and gap is not None:
+            if gap < profile.awake_for:
+                self.wake_stats["skips"] += 1
+                self.tracer.record("wake_skipped", gap=round(gap, 3))
+                _LOGGER.debug("Wake skipped (device active %.2fs ago)", gap)
+                return None
+            if urgent:
+                probe_until = profile.asleep_after or float("inf")
+            else:
+                probe_until = profile.probe_until
+            if self._acks_usable and profile.acks and gap < probe_until:
+                self.wake_stats["probes"] += 1
+                self.tracer.record("wake_probe", gap=round(gap, 3))
+                _LOGGER.debug("Wake skipped on probe (idle %.2fs)", gap)
+                return gap
 
         _LOGGER.debug("Sending wake command %s", CMD_POWER_ON)
-        await self._write_command(CMD_POWER_ON)
-        self._last_wake = now
+        self.wake_stats["wakes"] += 1
+        if not self._acks_usable:
+            await self._write_command(CMD_POWER_ON)
+            self._is_on = True
+            self._confirm_restored(("is_on",))
+            with self.tracer.span("wake_sleep", latency=round(profile.latency, 3)):
+                await asyncio.sleep(profile.latency)
+            self.metrics.record(METRIC_WAKE, monotonic() - now)
+            self.tracer.record("wake", monotonic() - now, forced=force)
+            return None
+
+        timeout = min(WAKE_ACK_TIMEOUT, max(profile.latency * 3, WAKE_MIN_DELAY * 4))
+        rtt = await self._async_write_acked(CMD_POWER_ON, retries=1, timeout=timeout)
         self._is_on = True
-        await asyncio.sleep(WAKE_DELAY)
+        self._confirm_restored(("is_on",))
+        self.metrics.record(METRIC_WAKE, monotonic() - now)
+        self.tracer.record("wake", monotonic() - now, forced=force)
+        if rtt is not None:
+            self.wake_stats["acked"] += 1
+            profile.record_latency(rtt)
+            self._schedule_profile_save()
+        return None
+
+    @callback
+    def _schedule_profile_save(self) -> None:
+        if self._cancel_profile_save is None:
+            self._cancel_profile_save = async_call_later(
+                self.hass, WAKE_PROFILE_SAVE_DELAY, self._handle_profile_save
+            )
+
+    @callback
+    def _handle_profile_save(self, _now: datetime | None) -> None:
+        """Keep the learned wake profile in the config entry."""
+        self._cancel_profile_save = None
+        profile = self._wake_profile.as_dict()
+        if self.entry.data.get(CONF_WAKE_PROFILE) == profile:
+            return
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, CONF_WAKE_PROFILE: profile}
+        )
 
-    async def async_send_command(self, command: str, *, ensure_wake: bool = True) -> None:
-        """Public command sender with wake/lock/connection handling."""
+    async def async_send_command(
+        self,
+        command: str,
+        *,
+        ensure_wake: bool = True,
+        command_class: str = COMMAND_CLASS_RAW,
+        on_sent: Callable[[], None] | None = None,
+        timeout: float | None = None,
+        force: bool = False,
+    ) -> None:
+        """Queue a command; only the newest pending one per class is sent.
+
+        Callers whose command was replaced resolve together with the
+        command that replaced it. ``on_sent`` runs once the write succeeded.
+        ``timeout`` bounds the whole trip, queue and lock wait included.
+        A command that would leave a recently confirmed state unchanged is
+        skipped unless ``force`` is set.
+        """
         if not command:
             _LOGGER.debug("Empty command ignored")
             return
+        target = command_state(command)
+        if (
+            not force
+            and command not in PRIORITY_COMMANDS
+            and command_class not in self._queue
+            and not self._keys_in_flight(target)
+            and self.confidence.matches(target, self._device_state(), monotonic())
+        ):
+            self.queue_stats["noop_skipped"] += 1
+            self.tracer.record("noop_skipped", command=command)
+            _LOGGER.debug("Skipping %s: device already in that state", command)
+            return
+
+        step = _SequenceStep(
+            STEP_RAW, command, command, ensure_wake, urgent=command in PRIORITY_COMMANDS
+        )
+        # Недосяжний пристрій: не показуємо стан, який одразу ж відкотиться
+        self._check_circuit()
+        owner = self._set_pending(target)
+        try:
+            await self._async_enqueue(command_class, [step], on_sent, timeout)
+        except UpdateFailed as err:
+            self._rollback_pending(owner, command, err)
+            raise
+        finally:
+            self._settle_pending(owner)
+
+    async def async_run_sequence(
+        self, steps: list[dict[str, Any]], timeout: float | None = None
+    ) -> list[dict[str, Any]]:
+        """Run ordered steps under one connection; return step timing.
+
+        Without ``timeout`` the budget is COMMAND_TIMEOUT plus the step delays.
+        """
+        resolved = [
+            self._resolve_step(
+                step[ATTR_ACTION], step.get(ATTR_VALUE), step.get(ATTR_DELAY, 0.0)
+            )
+            for step in steps
+        ]
+        if not resolved:
+            return []
+        # Послідовності не зливаються: кожна має власний клас
+        command_class = f"{COMMAND_CLASS_SEQUENCE}_{next(self._sequence_ids)}"
+        if timeout is None:
+            timeout = COMMAND_TIMEOUT + sum(step.delay for step in resolved)
+        return await self._async_enqueue(command_class, resolved, None, timeout)
+
+    @staticmethod
+    def _resolve_step(action: str, value: Any, delay: float) -> _SequenceStep:
+        """Map a sequence step to its command and resulting state."""
+        step = _SequenceStep(action, value, delay=float(delay or 0.0))
+        if action == STEP_TURN_ON:
+            step.command = CMD_POWER_ON
+            step.ensure_wake = False
+            step.state = {"is_on": True}
+        elif action == STEP_TURN_OFF or (action == STEP_SPEED and value == 0):
+            step.command = CMD_POWER_OFF
+            step.state = {"is_on": False, "swing_speed": 0}
+        elif action == STEP_SPEED:
+            if value not in SWING_SPEEDS:
+                raise ValueError(f"Unknown swing speed {value}")
+            step.command = SWING_SPEEDS[value]
+            step.state = {"is_on": True, "swing_speed": value}
+        elif action == STEP_MELODY:
+            if value not in MELODIES:
+                raise ValueError(f"Unknown melody {value}")
+            step.command = MELODIES[value]
+            step.state = {"melody_on": True, "current_melody": value}
+        elif action == STEP_MELODY_OFF:
+            step.state = {"melody_on": False}
+        elif action == STEP_TIMER:
+            step.state = {"timer": int(value or 0)}
+        elif action == STEP_INDUCTION:
+            step.state = {"induction_mode": bool(value)}
+        elif action == STEP_RAW:
+            if not value:
+                raise ValueError("Raw step needs a command")
+            step.command = str(value)
+        else:
+            raise ValueError(f"Unknown action {action}")
+        return step
+
+    async def _async_enqueue(
+        self,
+        command_class: str,
+        steps: list[_SequenceStep],
+        on_sent: Callable[[], None] | None,
+        timeout: float | None = None,
+    ) -> Any:
+        self._check_circuit()
+        future: asyncio.Future[Any] = self.hass.loop.create_future()
+        self.queue_stats["enqueued"] += 1
+        started = monotonic()
+        queued = _QueuedCommand(
+            steps,
+            on_sent,
+            [future],
+            self.tracer.new_trace(),
+            started + (COMMAND_TIMEOUT if timeout is None else timeout),
+        )
+        self.tracer.record(
+            "enqueue", trace=queued.trace, command_class=command_class, command=queued.command
+        )
+        if pending := self._queue.get(command_class):
+            self.queue_stats["coalesced"] += 1
+            self.tracer.record("coalesced", trace=pending.trace, replaced_by=queued.trace)
+            _LOGGER.debug(
+                "Coalescing %s: %s replaced by %s",
+                command_class,
+                pending.command,
+                queued.command,
+            )
+            queued.waiters[:0] = pending.waiters
+            # Замінена команда мала своїх чекачів: бюджет - найдовший з двох
+            queued.deadline = max(queued.deadline, pending.deadline)
+        if queued.priority:
+            self._async_preempt(command_class, queued)
+        else:
+            self._queue[command_class] = queued
+
+        if self._queue_task is None or self._queue_task.done():
+            self._queue_task = self.entry.async_create_background_task(
+                self.hass, self._async_process_queue(), f"{DOMAIN}_queue_{self.address}"
+            )
+
+        try:
+            # Обробник сам дотримується дедлайну; це - запобіжник на випадок,
+            # якщо він не відповість зовсім
+            async with asyncio.timeout(queued.deadline - monotonic() + COMMAND_DEADLINE_GRACE):
+                return await future
+        except TimeoutError as err:
+            self.queue_stats["timed_out"] += 1
+            self._async_abandon(command_class, queued)
+            raise UpdateFailed(f"Command {queued.command} timed out") from err
+        except asyncio.CancelledError:
+            if self._async_abandon(command_class, queued):
+                self.queue_stats["expired"] += 1
+            raise
+        finally:
+            duration = monotonic() - started
+            self.metrics.record(METRIC_STOP if queued.priority else METRIC_COMMAND, duration)
+            self.tracer.record("command", duration, trace=queued.trace)
+
+    @callback
+    def _keys_in_flight(self, keys: dict[str, Any]) -> bool:
+        """True if a pending, queued or sending job will change any of ``keys``.
+
+        Such a job would leave the device elsewhere than the confirmed state,
+        so a command restoring that state is not a no-op.
+        """
+        if any(key in self._pending_state for key in keys):
+            return True
+        jobs = [*self._queue.values(), *((self._sending,) if self._sending else ())]
+        return any(not job.keys.isdisjoint(keys) for job in jobs)
+
+    @callback
+    def _async_abandon(self, command_class: str, queued: _QueuedCommand) -> bool:
+        """Drop a job nobody waits for anymore so it does not hold the link."""
+        if all(waiter.done() for waiter in queued.waiters):
+            if self._queue.get(command_class) is queued:
+                del self._queue[command_class]
+                return True
+        return False
+
+    @callback
+    def _async_preempt(self, command_class: str, queued: _QueuedCommand) -> None:
+        """Put a priority job first and fold in the jobs it makes pointless.
+
+        Folded callers resolve with the priority job, like coalesced ones.
+        """
+        queue = {command_class: queued}
+        for pending_class, pending in self._queue.items():
+            if pending_class == command_class:
+                continue
+            if pending_class in PREEMPTED_CLASSES and not pending.priority:
+                self.queue_stats["preempted"] += 1
+                self.tracer.record("preempted", trace=pending.trace, replaced_by=queued.trace)
+                queued.waiters[:0] = pending.waiters
+                queued.deadline = max(queued.deadline, pending.deadline)
+                continue
+            queue[pending_class] = pending
+        self._queue = queue
+
+    async def _async_process_queue(self) -> None:
+        """Send queued jobs one at a time until the queue is empty."""
+        while self._queue:
+            command_class = next(iter(self._queue))
+            queued = self._queue.pop(command_class)
+            self._sending = queued
+            self.tracer.activate(queued.trace)
+            try:
+                remaining = queued.deadline - monotonic()
+                if remaining <= 0:
+                    # Застаріла команда не доходить до радіо
+                    self.queue_stats["expired"] += 1
+                    self.tracer.record("expired")
+                    raise UpdateFailed(f"Command {queued.command} expired before sending")
+                try:
+                    # Бюджет покриває лінк, підключення, пробудження і запис;
+                    # скасування звільняє лінк, а з'єднання лишається живим
+                    async with asyncio.timeout(remaining):
+                        with self.tracer.span("transmit", command=queued.command):
+                            result = await self._async_transmit(queued.steps)
+                except TimeoutError as err:
+                    self.queue_stats["timed_out"] += 1
+                    _LOGGER.warning(
+                        "Command %s to %s missed its deadline", queued.command, self.address
+                    )
+                    raise UpdateFailed(f"Command {queued.command} timed out") from err
+            except asyncio.CancelledError:
+                for waiter in queued.waiters:
+                    waiter.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if isinstance(err, UpdateFailed):
+                    failure = err
+                else:
+                    # Неочікувана помилка не повинна зупиняти обробник черги
+                    _LOGGER.exception(
+                        "Unexpected error sending %s to %s", queued.command, self.address
+                    )
+                    failure = UpdateFailed(f"Command {queued.command} failed: {err}")
+                self.queue_stats["failed"] += 1
+                for waiter in queued.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(failure)
+                # Діагностичні сенсори оновлюються і без зміни стану
+                self.async_update_listeners()
+                continue
+            finally:
+                self._sending = None
+
+            self.queue_stats["sent"] += 1
+            if queued.on_sent:
+                queued.on_sent()
+            else:
+                self.async_update_listeners()
+            for waiter in queued.waiters:
+                if not waiter.done():
+                    waiter.set_result(result)
+
+    async def _async_write_probe(self, command: str, gap: float) -> None:
+        """Write without waking and verify the device answered; wake if not."""
+        profile = self._wake_profile
+        try:
+            rtt = await self._async_write_acked(command, retries=0)
+        except UpdateFailed:
+            rtt = None
+        if rtt is not None:
+            profile.mark_awake(gap)
+            self._schedule_profile_save()
+            return
 
-        async with self._lock:
+        self.wake_stats["probe_failures"] += 1
+        profile.mark_asleep(gap)
+        self._schedule_profile_save()
+        _LOGGER.debug("Device asleep after %.2fs idle, waking and resending", gap)
+        await self._wake_device(force=True)
+        await self._async_write_acked(command)
+
+    async def _async_transmit(self, steps: list[_SequenceStep]) -> list[dict[str, Any]]:
+        """Connect and wake once, then write every step in order."""
+        results: list[dict[str, Any]] = []
+        if self._link_lock.locked():
+            self.queue_stats["lock_contention"] += 1
+        started = monotonic()
+        async with self._link_lock:
+            waited = monotonic() - started
+            self.metrics.record(METRIC_LOCK_WAIT, waited)
+            self.tracer.record("lock_wait", waited)
+            if self._client and self._client.is_connected:
+                self.connection_stats["warm_commands"] += 1
+                if self._preconnected:
+                    self.connection_stats["preconnect_hits"] += 1
+            else:
+                self.connection_stats["cold_commands"] += 1
+            self._preconnected = False
+
+            session_started = monotonic()
+            relinked = False
+            while True:
+                linked = False
+                try:
+                    await self._ensure_connected()
+                    linked = True
+                    await self._async_write_steps(steps, results, session_started)
+                    break
+                except Exception as err:
+                    connected = bool(self._client and self._client.is_connected)
+                    kind = classify_error(err, connected)
+                    failed = steps[min(len(results), len(steps) - 1)]
+                    if kind == ERROR_LINK_LOST and linked and not relinked:
+                        # Лінк зник посеред сесії: одне перепідключення і
+                        # продовжуємо з кроку, що не вдався
+                        relinked = True
+                        self.connection_stats["link_losses"] += 1
+                        self.tracer.record("link_lost", step=failed.command or failed.action)
+                        _LOGGER.debug("Link to %s lost (%s), reconnecting", self.address, err)
+                        await self._async_drop_link()
+                        continue
+                    _LOGGER.error("Error sending %s: %s", failed.command or failed.action, err)
+                    if kind != ERROR_TRANSIENT:
+                        await self._async_drop_link()
+                    raise UpdateFailed(f"Send failed: {err}") from err
+
+            self._record_usage()
+            self._arm_idle_timer()
+            if self._has_slot:
+                self._slots.async_idle(self._slot_source, self)
+        return results
+
+    async def _async_drop_link(self) -> None:
+        if self._client:
             try:
-                await self._ensure_connected()
+                await self._client.disconnect()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Disconnect from %s failed: %s", self.address, err)
+        # Мертвий лінк може не викликати disconnected_callback
+        self._client = None
+        self._release_slot()
+        self._last_link = monotonic()
+        self._path = None
+        self._write_char = None
+        self._notify_char = None
+        self._notify_started = False
 
-                if ensure_wake and command != CMD_POWER_ON:
-                    await self._wake_device()
+    async def _async_write_steps(
+        self,
+        steps: list[_SequenceStep],
+        results: list[dict[str, Any]],
+        session_started: float,
+    ) -> None:
+        """Write the steps not done yet, appending their timing.
 
-                await self._write_command(command)
-            except Exception as err:
-                _LOGGER.error("Error sending %s: %s", command, err)
-                if self._client:
-                    await self._client.disconnect()
-                self._client = None
-                raise UpdateFailed(f"Send failed: {err}") from err
+        The device is woken before the first write and again before any
+        later write that follows an idle gap, such as a long step delay,
+        in which it may have fallen asleep.
+        """
+        pending = steps[len(results):]
+        probe_gap = None
+        first = next((step for step in pending if step.command), None)
+        if first and first.ensure_wake and first.command != CMD_POWER_ON:
+            probe_gap = await self._wake_device(urgent=first.urgent)
+
+        wrote = False
+        for step in pending:
+            step_started = monotonic()
+            if step.command:
+                if wrote and not self._acks_usable:
+                    await asyncio.sleep(SEQUENCE_SPACING)
+                if (
+                    wrote
+                    and step.ensure_wake
+                    and step.command != CMD_POWER_ON
+                    and self._last_activity is not None
+                    and monotonic() - self._last_activity >= self._wake_profile.awake_for
+                ):
+                    probe_gap = await self._wake_device(urgent=step.urgent)
+                if probe_gap is not None:
+                    await self._async_write_probe(step.command, probe_gap)
+                    probe_gap = None
+                elif (
+                    await self._async_write_acked(step.command) is None
+                    and step.command == CMD_POWER_ON
+                    and step is not steps[-1]
+                ):
+                    # Без ехо чекаємо вивчену затримку пробудження
+                    with self.tracer.span("wake_sleep"):
+                        await asyncio.sleep(self._wake_profile.latency)
+                wrote = True
+            changed = bool(step.state) and self._apply_state(step.state)
+            if (step.command and self._confirm_restored(command_state(step.command))) or changed:
+                self.async_set_updated_data(self._build_data())
+            results.append(
+                {
+                    "action": step.action,
+                    "value": step.value,
+                    "command": step.command,
+                    "started": round(step_started - session_started, 4),
+                    "duration": round(monotonic() - step_started, 4),
+                }
+            )
+            if step.delay:
+                with self.tracer.span("step_delay"):
+                    await asyncio.sleep(step.delay)
 
     # --- КЕРУВАННЯ ---
 
-    async def async_turn_on(self) -> None:
+    async def async_turn_on(self, *, force: bool = False) -> None:
         """Увімкнення."""
-        await self.async_send_command(CMD_POWER_ON, ensure_wake=False)
-        self._is_on = True
-        self.async_set_updated_data(await self._async_update_data())
+
+        @callback
+        def _applied() -> None:
+            self._is_on = True
+            self.async_set_updated_data(self._build_data())
+
+        await self.async_send_command(
+            CMD_POWER_ON,
+            ensure_wake=False,
+            command_class=COMMAND_CLASS_POWER,
+            on_sent=_applied,
+            force=force,
+        )
 
     async def async_turn_off(self) -> None:
         """Вимкнення."""
-        await self.async_send_command(CMD_POWER_OFF)
-        self._is_on = False
-        self._swing_speed = 0
-        self.async_set_updated_data(await self._async_update_data())
 
-    async def async_set_swing_speed(self, speed: int) -> None:
+        @callback
+        def _applied() -> None:
+            self._is_on = False
+            self._swing_speed = 0
+            self.async_set_updated_data(self._build_data())
+
+        await self.async_send_command(
+            CMD_POWER_OFF, command_class=COMMAND_CLASS_POWER, on_sent=_applied
+        )
+
+    async def async_set_swing_speed(self, speed: int, *, force: bool = False) -> None:
         """Встановлення швидкості."""
         if speed == 0:
             await self.async_turn_off()
@@ -219,20 +2191,35 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             _LOGGER.error("Unknown swing speed %s", speed)
             return
 
+        @callback
+        def _applied() -> None:
+            self._swing_speed = speed
+            self._is_on = True
+            self.async_set_updated_data(self._build_data())
+
         _LOGGER.debug("Setting swing speed %s via %s", speed, cmd)
-        await self.async_send_command(cmd)
-        self._swing_speed = speed
-        self._is_on = True
-        self.async_set_updated_data(await self._async_update_data())
+        await self.async_send_command(
+            cmd, command_class=COMMAND_CLASS_SPEED, on_sent=_applied, force=force
+        )
 
     # --- МЕЛОДІЇ ---
 
-    async def async_set_melody(self, melody: int) -> None:
-        if melody in MELODIES:
-            await self.async_send_command(MELODIES[melody])
+    async def async_set_melody(self, melody: int, *, force: bool = False) -> None:
+        if melody not in MELODIES:
+            return
+
+        @callback
+        def _applied() -> None:
             self._current_melody = melody
             self._melody_on = True
-            self.async_set_updated_data(await self._async_update_data())
+            self.async_set_updated_data(self._build_data())
+
+        await self.async_send_command(
+            MELODIES[melody],
+            command_class=COMMAND_CLASS_MELODY,
+            on_sent=_applied,
+            force=force,
+        )
 
     async def async_melody_on(self) -> None:
         await self.async_set_melody(self._current_melody)
@@ -241,7 +2228,8 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         # Якщо відома команда вимкнення музики - розкоментуйте
         # await self.async_send_command("cmd00")
         self._melody_on = False
-        self.async_set_updated_data(await self._async_update_data())
+        self._confirm_restored(("melody_on",))
+        self.async_set_updated_data(self._build_data())
 
     async def async_next_melody(self) -> None:
         next_m = self._current_melody + 1
@@ -259,25 +2247,56 @@ class PTBabyCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         """Вмикання/вимикання індукційного режиму."""
         # Тут можна додати команду, якщо вона відома
         self._induction_mode = enabled
-        self.async_set_updated_data(await self._async_update_data())
+        self._confirm_restored(("induction_mode",))
+        self.async_set_updated_data(self._build_data())
 
     async def async_set_timer(self, minutes: int) -> None:
         """Встановлення таймера."""
         self._timer = minutes
-        self.async_set_updated_data(await self._async_update_data())
+        self._confirm_restored(("timer",))
+        self.async_set_updated_data(self._build_data())
 
     async def async_volume_up(self) -> None:
         """Збільшення гучності."""
         self._volume = min(100, self._volume + 10)
         # Додати команду гучності
-        self.async_set_updated_data(await self._async_update_data())
+        self._confirm_restored(("volume",))
+        self.async_set_updated_data(self._build_data())
 
     async def async_volume_down(self) -> None:
         """Зменшення гучності."""
         self._volume = max(0, self._volume - 10)
         # Додати команду гучності
-        self.async_set_updated_data(await self._async_update_data())
+        self._confirm_restored(("volume",))
+        self.async_set_updated_data(self._build_data())
 
     async def async_shutdown(self) -> None:
+        self._async_stop_presence()
+        self._cancel_idle_timer()
+        if self._cancel_reconnect:
+            self._cancel_reconnect()
+            self._cancel_reconnect = None
+        if self._cancel_half_open:
+            self._cancel_half_open()
+            self._cancel_half_open = None
+        if self._cancel_profile_save:
+            self._cancel_profile_save()
+            self._handle_profile_save(None)
+        if self._queue_task and not self._queue_task.done():
+            self._queue_task.cancel()
+        for queued in self._queue.values():
+            for waiter in queued.waiters:
+                if not waiter.done():
+                    waiter.cancel()
+        self._queue.clear()
+        if self._cancel_preconnect:
+            self._cancel_preconnect()
+            self._cancel_preconnect = None
+        await self._store.async_save(self._data_to_store())
+        if self._handoff is not None:
+            handoff, self._handoff = self._handoff, None
+            await handoff.async_disconnect()
         if self._client:
-            await self._client.disconnect()
\ No newline at end of file
+            self._expected_disconnect = True
+            await self._client.disconnect()
+        self._release_slot()
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""Diagnostics support for PT Baby Swing."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_MAC_ADDRESS
+from .coordinator import PTBabyCoordinator
+
+TO_REDACT = {CONF_MAC_ADDRESS, "unique_id", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: PTBabyCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": coordinator.data,
+        "connection": coordinator.connection_diagnostics(),
+        "metrics": coordinator.metrics.as_dict(),
+        "trace": coordinator.tracer.events(),
+    }
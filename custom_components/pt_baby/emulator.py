@@ -0,0 +1,365 @@
+"""Virtual PT Baby Swing cradles for running the integration without hardware.
+
+The emulator registers a connectable remote scanner with the bluetooth
+integration, the same way a Bluetooth proxy does. Virtual cradles are
+advertised through it, so discovery, the config flow and the coordinator
+use their usual code paths (``establish_connection`` included); only the
+radio underneath is simulated.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Any, Callable
+
+from bleak.backends.client import BaseBleakClient
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CMD_POWER_ON,
+    EMULATOR_ADV_INTERVAL,
+    EMULATOR_CONNECT_LATENCY,
+    EMULATOR_NOTIFY_CHAR_UUID,
+    EMULATOR_NOTIFY_LATENCY,
+    EMULATOR_SERVICE_UUID,
+    EMULATOR_SLEEP_AFTER,
+    EMULATOR_SOURCE,
+    EMULATOR_WAKE_LATENCY,
+    EMULATOR_WRITE_CHAR_UUID,
+    EMULATOR_WRITE_LATENCY,
+    LOCAL_NAME_PREFIX,
+)
+from .protocol import decode_notification
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class EmulatorProfile:
+    """Link timing (seconds) and packet loss (0..1) of the virtual cradles."""
+
+    connect_latency: float = EMULATOR_CONNECT_LATENCY
+    write_latency: float = EMULATOR_WRITE_LATENCY
+    notify_latency: float = EMULATOR_NOTIFY_LATENCY
+    loss: float = 0.0
+    sleep_after: float = EMULATOR_SLEEP_AFTER
+    wake_latency: float = EMULATOR_WAKE_LATENCY
+
+
+class _VirtualCharacteristic:
+    def __init__(self, uuid: str, handle: int, properties: list[str]) -> None:
+        self.uuid = uuid
+        self.handle = handle
+        self.properties = properties
+        self.descriptors: list[Any] = []
+
+
+class _VirtualService:
+    def __init__(self, uuid: str, handle: int, characteristics: list[_VirtualCharacteristic]) -> None:
+        self.uuid = uuid
+        self.handle = handle
+        self.description = "PT Baby Swing (emulated)"
+        self.characteristics = characteristics
+
+
+class _VirtualServiceCollection:
+    """GATT table of a virtual cradle: one write and one notify characteristic."""
+
+    def __init__(self) -> None:
+        self._chars = [
+            _VirtualCharacteristic(EMULATOR_WRITE_CHAR_UUID, 3, ["write-without-response", "write"]),
+            _VirtualCharacteristic(EMULATOR_NOTIFY_CHAR_UUID, 5, ["notify"]),
+        ]
+        self.services = {1: _VirtualService(EMULATOR_SERVICE_UUID, 1, self._chars)}
+
+    def __iter__(self):
+        return iter(self.services.values())
+
+    def get_service(self, specifier: int | str) -> _VirtualService | None:
+        for service in self.services.values():
+            if specifier in (service.handle, service.uuid):
+                return service
+        return None
+
+    def get_characteristic(self, specifier: Any) -> _VirtualCharacteristic | None:
+        if isinstance(specifier, _VirtualCharacteristic):
+            return specifier
+        if isinstance(specifier, str):
+            specifier = specifier.lower()
+        for char in self._chars:
+            if specifier in (char.handle, char.uuid):
+                return char
+        return None
+
+
+class PTBabyVirtualDevice:
+    """Internal model of one emulated cradle."""
+
+    def __init__(
+        self,
+        address: str,
+        name: str,
+        rssi: int,
+        profile: EmulatorProfile,
+        rng: random.Random,
+    ) -> None:
+        self.address = address
+        self.name = name
+        self.rssi = rssi
+        self.profile = profile
+        self.connected = False
+        self.is_on = False
+        self.swing_speed = 0
+        self.melody_on = False
+        self.current_melody = 1
+        self.timer = 0
+        self.induction_mode = False
+        self.commands = 0
+        self.ignored = 0
+        self.lost = 0
+        self._rng = rng
+        self._last_command: float | None = None
+
+    def asleep(self, now: float) -> bool:
+        """The cradle dozes off after ``sleep_after`` seconds without commands."""
+        return self._last_command is None or now - self._last_command > self.profile.sleep_after
+
+    def handle_write(self, command: str, now: float) -> tuple[float, bytes] | None:
+        """Apply one write; return (delay, notify payload) or None if unanswered."""
+        if self._rng.random() < self.profile.loss:
+            self.lost += 1
+            return None
+        asleep = self.asleep(now)
+        if asleep and command != CMD_POWER_ON:
+            # Сплячий пристрій ігнорує все, крім пробудження
+            self.ignored += 1
+            return None
+
+        self._last_command = now
+        self.commands += 1
+        for key, value in decode_notification(command.encode()).state.items():
+            setattr(self, key, value)
+        delay = self.profile.notify_latency + (self.profile.wake_latency if asleep else 0)
+        return delay, f"{command};".encode() + self.status_frame()
+
+    def status_frame(self) -> bytes:
+        """Status frame in the cradle's ``st:p=1,s=2,...`` format."""
+        melody = self.current_melody if self.melody_on else 0
+        return (
+            f"st:p={int(self.is_on)},s={self.swing_speed},m={melody},"
+            f"t={self.timer},i={int(self.induction_mode)}"
+        ).encode()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "address": self.address,
+            "name": self.name,
+            "connected": self.connected,
+            "asleep": self.asleep(monotonic()),
+            "is_on": self.is_on,
+            "swing_speed": self.swing_speed,
+            "melody_on": self.melody_on,
+            "current_melody": self.current_melody,
+            "timer": self.timer,
+            "induction_mode": self.induction_mode,
+            "commands": self.commands,
+            "ignored": self.ignored,
+            "lost": self.lost,
+        }
+
+
+class PTBabyEmulatedClient(BaseBleakClient):
+    """Bleak backend talking to a virtual cradle.
+
+    ``emulator`` is set on a per-emulator subclass, see ``PTBabyEmulator``.
+    """
+
+    emulator: PTBabyEmulator
+
+    def __init__(self, address_or_ble_device: BLEDevice | str, **kwargs: Any) -> None:
+        super().__init__(address_or_ble_device, **kwargs)
+        self._device = self.emulator.devices.get(self.address.upper())
+        self._connected = False
+        self._notify_callback: Callable[[bytearray], None] | None = None
+
+    @property
+    def name(self) -> str:
+        return self._device.name if self._device else self.address
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def mtu_size(self) -> int:
+        return 23
+
+    async def connect(self, *args: Any, **kwargs: Any) -> bool:
+        device = self._device
+        if device is None:
+            raise BleakError(f"Virtual device {self.address} does not exist")
+        if device.connected:
+            raise BleakError(f"Virtual device {self.address} is already connected")
+        await asyncio.sleep(device.profile.connect_latency)
+        device.connected = True
+        self._connected = True
+        self.services = _VirtualServiceCollection()
+        self.emulator.clients.add(self)
+        return True
+
+    async def disconnect(self) -> bool:
+        if not self._connected:
+            return True
+        self._connected = False
+        self._notify_callback = None
+        self._device.connected = False
+        self.emulator.clients.discard(self)
+        if self._disconnected_callback:
+            self._disconnected_callback()
+        return True
+
+    async def get_services(self, **kwargs: Any) -> _VirtualServiceCollection:
+        return self.services
+
+    async def pair(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    async def unpair(self) -> bool:
+        return True
+
+    def _check_connected(self) -> None:
+        if not self._connected:
+            raise BleakError(f"Not connected to {self.address}")
+
+    async def read_gatt_char(self, char_specifier: Any, **kwargs: Any) -> bytearray:
+        self._check_connected()
+        return bytearray(self._device.status_frame())
+
+    async def read_gatt_descriptor(self, handle: int, **kwargs: Any) -> bytearray:
+        raise BleakError("Virtual cradle has no descriptors")
+
+    async def write_gatt_descriptor(self, handle: int, data: Any) -> None:
+        raise BleakError("Virtual cradle has no descriptors")
+
+    async def write_gatt_char(self, char_specifier: Any, data: Any, response: bool = False) -> None:
+        self._check_connected()
+        device = self._device
+        await asyncio.sleep(device.profile.write_latency)
+        self._check_connected()
+        reply = device.handle_write(bytes(data).decode("ascii", errors="ignore"), monotonic())
+        if reply is not None:
+            delay, payload = reply
+            asyncio.get_running_loop().call_later(delay, self._notify, payload)
+
+    async def start_notify(
+        self, characteristic: Any, callback: Callable[[bytearray], None], **kwargs: Any
+    ) -> None:
+        self._check_connected()
+        self._notify_callback = callback
+
+    async def stop_notify(self, char_specifier: Any) -> None:
+        self._notify_callback = None
+
+    def _notify(self, payload: bytes) -> None:
+        if self._connected and self._notify_callback:
+            self._notify_callback(bytearray(payload))
+
+
+class PTBabyEmulatorScanner(bluetooth.BaseHaRemoteScanner):
+    """Connectable remote scanner that hears the virtual cradles."""
+
+    @callback
+    def async_advertise(self, device: PTBabyVirtualDevice) -> None:
+        self._async_on_advertisement(
+            address=device.address,
+            rssi=device.rssi,
+            local_name=device.name,
+            service_uuids=[EMULATOR_SERVICE_UUID],
+            service_data={},
+            manufacturer_data={},
+            tx_power=None,
+            details={"source": self.source},
+            advertisement_monotonic_time=bluetooth.MONOTONIC_TIME(),
+        )
+
+
+class PTBabyEmulator:
+    """A set of virtual cradles advertised through one emulated scanner."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        count: int,
+        profile: EmulatorProfile,
+        seed: int | None = None,
+    ) -> None:
+        self.hass = hass
+        self.profile = profile
+        rng = random.Random(seed)
+        self.devices: dict[str, PTBabyVirtualDevice] = {}
+        for index in range(1, count + 1):
+            # Локально адміністровані адреси, щоб не перетнутися зі справжніми
+            address = f"02:50:54:42:{index // 256:02X}:{index % 256:02X}"
+            self.devices[address] = PTBabyVirtualDevice(
+                address,
+                f"{LOCAL_NAME_PREFIX}-EMU{index:02d}",
+                -50 - index % 40,
+                profile,
+                rng,
+            )
+        self.clients: set[PTBabyEmulatedClient] = set()
+        client_class = type(
+            "PTBabyEmulatedClient", (PTBabyEmulatedClient,), {"emulator": self}
+        )
+        self.scanner = PTBabyEmulatorScanner(
+            EMULATOR_SOURCE,
+            EMULATOR_SOURCE,
+            connector=bluetooth.HaBluetoothConnector(
+                client=client_class, source=EMULATOR_SOURCE, can_connect=lambda: True
+            ),
+            connectable=True,
+        )
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Register the scanner and start advertising."""
+        self._unsubs = [
+            bluetooth.async_register_scanner(self.hass, self.scanner),
+            self.scanner.async_setup(),
+            async_track_time_interval(
+                self.hass, self._async_advertise, timedelta(seconds=EMULATOR_ADV_INTERVAL)
+            ),
+        ]
+        self._async_advertise()
+        _LOGGER.info("Started %s virtual PT Baby cradles", len(self.devices))
+
+    @callback
+    def _async_advertise(self, _now: datetime | None = None) -> None:
+        for device in self.devices.values():
+            # Як і справжня колиска, під час з'єднання пристрій не рекламується
+            if not device.connected:
+                self.scanner.async_advertise(device)
+
+    async def async_stop(self) -> None:
+        """Drop every virtual link and unregister the scanner."""
+        for client in list(self.clients):
+            await client.disconnect()
+        while self._unsubs:
+            self._unsubs.pop()()
+        _LOGGER.info("Stopped virtual PT Baby cradles")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "profile": asdict(self.profile),
+            "devices": [device.as_dict() for device in self.devices.values()],
+        }
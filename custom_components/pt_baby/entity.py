@@ -1,6 +1,9 @@
 """Base entity for PT Baby Swing."""
 from __future__ import annotations
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -12,10 +15,13 @@ class PTBabyEntity(CoordinatorEntity[PTBabyCoordinator]):
     """Base class for PT Baby Swing entities."""
 
     _attr_has_entity_name = True
+    # Ключі coordinator.data, які показує сутність; None - писати стан завжди
+    _state_keys: tuple[str, ...] | None = None
 
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the entity."""
         super().__init__(coordinator)
+        self._written: tuple[Any, ...] | None = None
         # Отримуємо ім'я пристрою з конфігурації або ставимо дефолтне
         device_name = coordinator.entry.data.get(CONF_DEVICE_NAME, "PT Baby Swing")
 
@@ -25,4 +31,56 @@ class PTBabyEntity(CoordinatorEntity[PTBabyCoordinator]):
             manufacturer="PT Baby",
             model="Bluetooth Swing",
             sw_version="1.0",
-        )
\ No newline at end of file
+        )
+
+    @property
+    def available(self) -> bool:
+        """Available while the cradle is connected or advertising."""
+        return super().available and self.coordinator.device_available
+
+    @property
+    def pending(self) -> bool:
+        """True while a requested value is shown before the device confirmed it."""
+        pending = (self.coordinator.data or {}).get("pending", ())
+        return any(key in pending for key in self._state_keys or ())
+
+    @property
+    def restored(self) -> bool:
+        """True while a value restored after a restart is not confirmed yet."""
+        restored = (self.coordinator.data or {}).get("restored", ())
+        return any(key in restored for key in self._state_keys or ())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if not self._state_keys:
+            return None
+        return {"pending": self.pending, "restored": self.restored}
+
+    @callback
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        data = self.coordinator.data or {}
+        return (
+            self.available,
+            self.pending,
+            self.restored,
+            *(data.get(key) for key in self._state_keys or ()),
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity was added."""
+        await super().async_added_to_hass()
+        self._written = self._state_snapshot()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if availability or one of our keys changed."""
+        if self._state_keys is None:
+            super()._handle_coordinator_update()
+            return
+        snapshot = self._state_snapshot()
+        if snapshot == self._written:
+            self.coordinator.entity_stats["skipped"] += 1
+            return
+        self._written = snapshot
+        self.coordinator.entity_stats["writes"] += 1
+        self.async_write_ha_state()
\ No newline at end of file
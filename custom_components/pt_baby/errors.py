@@ -0,0 +1,39 @@
+"""Classification of BLE errors for PT Baby Swing."""
+from __future__ import annotations
+
+import asyncio
+
+from bleak.exc import BleakCharacteristicNotFoundError, BleakError
+
+# Помилка минула, лінк живий: можна повторити на тому ж з'єднанні
+ERROR_TRANSIENT = "transient"
+# З'єднання втрачено: потрібне перепідключення
+ERROR_LINK_LOST = "link_lost"
+# Все інше (немає характеристики, немає ехо, ...): лінк скидаємо
+ERROR_FATAL = "fatal"
+
+# Фрагменти повідомлень BlueZ/ESPHome/CoreBluetooth про розрив
+_LINK_LOST_MARKERS = (
+    "not connected",
+    "notconnected",
+    "disconnected",
+    "connection lost",
+    "connection was lost",
+    "no longer connected",
+)
+
+
+def classify_error(err: BaseException, connected: bool) -> str:
+    """Decide whether an error is worth retrying on the live link."""
+    if not connected:
+        return ERROR_LINK_LOST
+    if isinstance(err, BleakCharacteristicNotFoundError):
+        return ERROR_FATAL
+    if isinstance(err, (EOFError, ConnectionError)):
+        return ERROR_LINK_LOST
+    text = str(err).lower()
+    if any(marker in text for marker in _LINK_LOST_MARKERS):
+        return ERROR_LINK_LOST
+    if isinstance(err, (asyncio.TimeoutError, BleakError, OSError)):
+        return ERROR_TRANSIENT
+    return ERROR_FATAL
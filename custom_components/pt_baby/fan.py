@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.percentage import (
     percentage_to_ranged_value,
     ranged_value_to_percentage,
 )
 
-from .const import DOMAIN
+from .broadcast import async_broadcast, async_loaded_coordinators
+from .const import DOMAIN, DATA_FAN_GROUP, STEP_SPEED, STEP_TURN_OFF
 # ДОДАНО ІМПОРТИ, ЯКИХ НЕ ВИСТАЧАЛО:
 from .coordinator import PTBabyCoordinator
 from .entity import PTBabyEntity
@@ -30,6 +34,48 @@ async def async_setup_entry(
     """Set up the Baby Cradle fan."""
     coordinator: PTBabyCoordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities([PTBabyFan(coordinator)])
+    # Груповий вентилятор один на інтеграцію; його платформою може бути
+    # будь-який завантажений запис
+    host: _FanGroupHost = hass.data.setdefault(DATA_FAN_GROUP, _FanGroupHost())
+    host.adders[entry.entry_id] = async_add_entities
+    entry.async_on_unload(partial(host.async_remove_entry, hass, entry.entry_id))
+    if host.group is not None:
+        host.group.async_track(coordinator)
+    host.async_ensure_group()
+
+
+@dataclass
+class _FanGroupHost:
+    """Fan platforms able to host the group fan, and the group itself."""
+
+    adders: dict[str, AddEntitiesCallback] = field(default_factory=dict)
+    group: PTBabyGroupFan | None = None
+
+    @callback
+    def async_ensure_group(self) -> None:
+        """Add the group through a loaded entry's platform if there is none."""
+        if self.group is not None or not self.adders:
+            return
+        entry_id, add_entities = next(iter(self.adders.items()))
+        self.group = PTBabyGroupFan(self, entry_id)
+        add_entities([self.group])
+
+    @callback
+    def async_group_removed(self, group: PTBabyGroupFan) -> None:
+        """Move the group to another entry when its own entry goes away."""
+        if self.group is not group:
+            return
+        self.group = None
+        self.adders.pop(group.host_entry_id, None)
+        self.async_ensure_group()
+
+    @callback
+    def async_remove_entry(self, hass: HomeAssistant, entry_id: str) -> None:
+        self.adders.pop(entry_id, None)
+        if self.group is not None:
+            self.group.async_untrack(entry_id)
+        if not self.adders and hass.data.get(DATA_FAN_GROUP) is self:
+            del hass.data[DATA_FAN_GROUP]
 
 class PTBabyFan(PTBabyEntity, FanEntity):
     """Representation of Baby Cradle swing as a fan."""
@@ -40,6 +86,7 @@ class PTBabyFan(PTBabyEntity, FanEntity):
         FanEntityFeature.TURN_OFF
     )
     _attr_speed_count = 5
+    _state_keys = ("swing_speed",)
 
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the fan."""
@@ -83,4 +130,134 @@ class PTBabyFan(PTBabyEntity, FanEntity):
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan."""
-        await self.coordinator.async_set_swing_speed(0)
\ No newline at end of file
+        await self.coordinator.async_set_swing_speed(0)
+
+
+class PTBabyGroupFan(FanEntity):
+    """Swing of every configured cradle driven as one fan."""
+
+    _attr_should_poll = False
+    _attr_supported_features = (
+        FanEntityFeature.SET_SPEED |
+        FanEntityFeature.TURN_ON |
+        FanEntityFeature.TURN_OFF
+    )
+    _attr_speed_count = 5
+    _attr_unique_id = f"{DOMAIN}_all_swings"
+    _attr_name = "Усі колиски"
+    _attr_translation_key = "all_swings"
+    _attr_icon = "mdi:cradle"
+
+    def __init__(self, host: _FanGroupHost, entry_id: str) -> None:
+        """Initialize the group fan hosted by the platform of ``entry_id``."""
+        self._host = host
+        self.host_entry_id = entry_id
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._written: tuple[Any, ...] | None = None
+
+    @callback
+    def async_track(self, coordinator: PTBabyCoordinator) -> None:
+        """Follow one more cradle."""
+        entry_id = coordinator.entry.entry_id
+        if entry_id not in self._unsubs:
+            self._unsubs[entry_id] = coordinator.async_add_listener(self._handle_update)
+            self._handle_update()
+
+    @callback
+    def async_untrack(self, entry_id: str) -> None:
+        """Stop following the cradle of ``entry_id``."""
+        if unsub := self._unsubs.pop(entry_id, None):
+            unsub()
+            self._handle_update()
+
+    @callback
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        return (self.available, self.percentage, tuple(self._speeds))
+
+    @callback
+    def _handle_update(self) -> None:
+        """Write state only if what the group shows changed."""
+        if self.hass is None or self.platform is None:
+            return
+        snapshot = self._state_snapshot()
+        if snapshot == self._written:
+            return
+        self._written = snapshot
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Follow every cradle loaded so far."""
+        await super().async_added_to_hass()
+        self._written = self._state_snapshot()
+        for coordinator in async_loaded_coordinators(self.hass):
+            self.async_track(coordinator)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop following cradles and let another entry host the group."""
+        while self._unsubs:
+            self._unsubs.popitem()[1]()
+        self._host.async_group_removed(self)
+
+    @property
+    def _speeds(self) -> list[int]:
+        return [
+            (coordinator.data or {}).get("swing_speed", 0)
+            for coordinator in async_loaded_coordinators(self.hass)
+        ]
+
+    @property
+    def available(self) -> bool:
+        """Available while at least one cradle is."""
+        return any(
+            coordinator.device_available for coordinator in async_loaded_coordinators(self.hass)
+        )
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if any cradle swings."""
+        return any(speed > 0 for speed in self._speeds)
+
+    @property
+    def percentage(self) -> int | None:
+        """Return the fastest swing among the cradles."""
+        speed = max(self._speeds, default=0)
+        if speed == 0:
+            return 0
+        return ranged_value_to_percentage(SPEED_RANGE, speed)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, int]:
+        speeds = self._speeds
+        return {"cradles": len(speeds), "swinging": sum(speed > 0 for speed in speeds)}
+
+    async def _async_broadcast(self, step: dict[str, int | str]) -> None:
+        coordinators = async_loaded_coordinators(self.hass)
+        result = await async_broadcast(self.hass, coordinators, [step])
+        if result["failed"]:
+            raise HomeAssistantError(
+                f"Command failed on {result['failed']} of {len(coordinators)} cradles"
+            )
+
+    async def async_set_percentage(self, percentage: int) -> None:
+        """Set the same speed on every cradle."""
+        if percentage == 0:
+            await self.async_turn_off()
+            return
+
+        speed = int(percentage_to_ranged_value(SPEED_RANGE, percentage))
+        await self._async_broadcast({"action": STEP_SPEED, "value": speed})
+
+    async def async_turn_on(
+        self,
+        percentage: int | None = None,
+        preset_mode: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Turn on every cradle."""
+        if percentage is None:
+            percentage = 20  # Default to speed 1 (20%)
+        await self.async_set_percentage(percentage)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Stop every cradle."""
+        await self._async_broadcast({"action": STEP_TURN_OFF})
@@ -0,0 +1,73 @@
+"""GATT table helpers for PT Baby Swing."""
+from __future__ import annotations
+
+from typing import Any
+
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.backends.service import BleakGATTServiceCollection
+
+WRITE_PROPERTIES = {"write", "write-without-response"}
+NOTIFY_PROPERTIES = {"notify", "indicate"}
+
+
+def serialize_services(services: BleakGATTServiceCollection) -> list[dict[str, Any]]:
+    """Convert a discovered service collection into a storable table."""
+    return [
+        {
+            "uuid": service.uuid.lower(),
+            "handle": service.handle,
+            "description": service.description,
+            "characteristics": [
+                {
+                    "uuid": char.uuid.lower(),
+                    "handle": char.handle,
+                    "properties": list(char.properties),
+                }
+                for char in service.characteristics
+            ],
+        }
+        for service in services
+    ]
+
+
+def find_handle(table: list[dict[str, Any]] | None, uuid: str | None) -> int | None:
+    """Return the cached handle of a characteristic by UUID."""
+    if not table or not uuid:
+        return None
+    uuid = uuid.lower()
+    for service in table:
+        for char in service.get("characteristics", ()):
+            if char.get("uuid") == uuid:
+                return char.get("handle")
+    return None
+
+
+def resolve_cached(
+    services: BleakGATTServiceCollection, handle: int | None, uuid: str | None
+) -> BleakGATTCharacteristic | None:
+    """Look a characteristic up by cached handle, checking it still matches."""
+    if handle is None or not uuid:
+        return None
+    char = services.get_characteristic(handle)
+    if char is None or char.uuid.lower() != uuid.lower():
+        return None
+    return char
+
+
+def autodetect(table: list[dict[str, Any]]) -> tuple[str, str, str | None] | None:
+    """Pick the first service with a writable characteristic.
+
+    Returns (service, write, notify) UUIDs, or None if nothing is writable.
+    """
+    for service in table:
+        write_char: str | None = None
+        notify_char: str | None = None
+        for char in service["characteristics"]:
+            props = set(char["properties"])
+            if props & WRITE_PROPERTIES:
+                write_char = write_char or char["uuid"]
+            if props & NOTIFY_PROPERTIES:
+                notify_char = notify_char or char["uuid"]
+        if write_char:
+            return service["uuid"], write_char, notify_char
+    return None
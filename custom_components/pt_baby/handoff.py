@@ -0,0 +1,79 @@
+"""Hand the config flow's BLE connection over to the coordinator."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from bleak_retry_connector import BleakClientWithServiceCache
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_HANDOFF, HANDOFF_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionHandoff:
+    """An established client plus its service table, waiting for an owner."""
+
+    def __init__(self, address: str) -> None:
+        """Initialize before connecting so disconnects can be forwarded."""
+        self.address = address
+        self.client: BleakClientWithServiceCache | None = None
+        self.table: list[dict[str, Any]] = []
+        self.on_disconnect: Callable[[BleakClientWithServiceCache], None] | None = None
+        self._cancel_expire: CALLBACK_TYPE | None = None
+
+    @callback
+    def disconnected(self, client: BleakClientWithServiceCache) -> None:
+        """Forward the bleak disconnect callback to the current owner."""
+        if self.on_disconnect:
+            self.on_disconnect(client)
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self.client and self.client.is_connected)
+
+    async def async_disconnect(self) -> None:
+        if self._cancel_expire:
+            self._cancel_expire()
+            self._cancel_expire = None
+        if self.client:
+            await self.client.disconnect()
+            self.client = None
+
+
+@callback
+def async_offer(hass: HomeAssistant, handoff: ConnectionHandoff) -> None:
+    """Park a connection for the coordinator that is about to be set up."""
+    pending: dict[str, ConnectionHandoff] = hass.data.setdefault(DATA_HANDOFF, {})
+    if (previous := pending.pop(handoff.address, None)) and previous is not handoff:
+        hass.async_create_task(previous.async_disconnect())
+
+    @callback
+    def _expire(_now: datetime) -> None:
+        handoff._cancel_expire = None
+        if pending.get(handoff.address) is handoff:
+            del pending[handoff.address]
+            _LOGGER.debug("Unclaimed connection to %s expired", handoff.address)
+            hass.async_create_task(handoff.async_disconnect())
+
+    pending[handoff.address] = handoff
+    handoff._cancel_expire = async_call_later(hass, HANDOFF_TIMEOUT, _expire)
+
+
+@callback
+def async_claim(hass: HomeAssistant, address: str) -> ConnectionHandoff | None:
+    """Take a parked connection if it is still alive."""
+    handoff = hass.data.get(DATA_HANDOFF, {}).pop(address, None)
+    if handoff is None:
+        return None
+    if handoff._cancel_expire:
+        handoff._cancel_expire()
+        handoff._cancel_expire = None
+    if not handoff.is_connected:
+        return None
+    return handoff
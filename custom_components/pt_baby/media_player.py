@@ -39,6 +39,7 @@ class PTBabyMelodyPlayer(PTBabyEntity, MediaPlayerEntity):
         | MediaPlayerEntityFeature.SELECT_SOURCE
         | MediaPlayerEntityFeature.VOLUME_STEP
     )
+    _state_keys = ("melody_on", "current_melody")
 
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the media player."""
@@ -0,0 +1,96 @@
+"""Cheap latency histograms for the PT Baby command path."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+from .const import METRIC_BUCKETS
+
+METRIC_LOOKUP = "lookup"
+METRIC_CONNECT = "connect"
+# Очікування вільного слоту з'єднання на адаптері
+METRIC_SLOT_WAIT = "slot_wait"
+METRIC_WAKE = "wake"
+METRIC_WRITE = "write"
+# Час від першої тимчасової помилки запису до успішного повтору
+METRIC_WRITE_RETRY = "write_retry"
+METRIC_COMMAND = "command"
+# Повний час пріоритетних команд (вимкнення)
+METRIC_STOP = "stop"
+METRIC_LOCK_WAIT = "lock_wait"
+METRICS = (
+    METRIC_LOOKUP,
+    METRIC_CONNECT,
+    METRIC_SLOT_WAIT,
+    METRIC_WAKE,
+    METRIC_WRITE,
+    METRIC_WRITE_RETRY,
+    METRIC_COMMAND,
+    METRIC_STOP,
+    METRIC_LOCK_WAIT,
+)
+
+
+class PTBabyHistogram:
+    """Fixed-bucket histogram; recording is one bisect and a few adds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        # Останній кошик - все, що довше за METRIC_BUCKETS[-1]
+        self.counts = [0] * (len(METRIC_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(METRIC_BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = METRIC_BUCKETS[index - 1] if index else 0.0
+                upper = METRIC_BUCKETS[index] if index < len(METRIC_BUCKETS) else self.max
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        def ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+            "buckets": {
+                f"le_{bound}": count
+                for bound, count in zip((*METRIC_BUCKETS, "inf"), self.counts)
+            },
+        }
+
+
+class PTBabyMetrics:
+    """Histograms of every phase of the command path."""
+
+    def __init__(self) -> None:
+        self.histograms = {name: PTBabyHistogram() for name in METRICS}
+
+    def record(self, name: str, value: float) -> None:
+        self.histograms[name].record(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {name: histogram.as_dict() for name, histogram in self.histograms.items()}
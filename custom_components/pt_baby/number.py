@@ -32,6 +32,7 @@ class PTBabyTimer(PTBabyEntity, NumberEntity):
     _attr_native_step = 5
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
     _attr_mode = NumberMode.SLIDER
+    _state_keys = ("timer",)
 
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the timer."""
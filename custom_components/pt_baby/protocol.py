@@ -0,0 +1,103 @@
+"""Notification frame decoder for PT Baby Swing."""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from .const import (
+    CMD_MELODY_OFF,
+    CMD_POWER_OFF,
+    CMD_POWER_ON,
+    FRAME_SEPARATORS,
+    FRAME_STATUS_PREFIX,
+    MELODIES,
+    SWING_SPEEDS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_COMMAND_RE = re.compile(r"^cmd\d{2}$")
+_SPLIT_RE = re.compile(f"[{re.escape(FRAME_SEPARATORS)}]+")
+
+# Ехо-код команди -> зміни стану
+_COMMAND_STATE: dict[str, dict[str, Any]] = {
+    CMD_POWER_ON: {"is_on": True},
+    CMD_POWER_OFF: {"is_on": False, "swing_speed": 0},
+    CMD_MELODY_OFF: {"melody_on": False},
+    **{
+        cmd: {"is_on": True, "swing_speed": speed}
+        for speed, cmd in SWING_SPEEDS.items()
+    },
+    **{
+        cmd: {"melody_on": True, "current_melody": melody}
+        for melody, cmd in MELODIES.items()
+    },
+}
+
+
+@dataclass
+class DecodedFrame:
+    """Result of decoding one notification payload."""
+
+    commands: list[str] = field(default_factory=list)
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+def _decode_status(body: str) -> dict[str, Any]:
+    """Parse the ``p=1,s=2,m=4,t=30,i=0`` status body."""
+    fields: dict[str, int] = {}
+    for part in body.split(","):
+        key, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            fields[key.strip().lower()] = int(value)
+        except ValueError:
+            continue
+
+    state: dict[str, Any] = {}
+    if "p" in fields:
+        state["is_on"] = fields["p"] != 0
+    if "s" in fields and (fields["s"] == 0 or fields["s"] in SWING_SPEEDS):
+        state["swing_speed"] = fields["s"]
+    if "m" in fields:
+        if fields["m"] == 0:
+            state["melody_on"] = False
+        elif fields["m"] in MELODIES:
+            state["melody_on"] = True
+            state["current_melody"] = fields["m"]
+    if "t" in fields and fields["t"] >= 0:
+        state["timer"] = fields["t"]
+    if "i" in fields:
+        state["induction_mode"] = fields["i"] != 0
+    return state
+
+
+def command_state(command: str) -> dict[str, Any]:
+    """State a known command leaves the device in (empty if unknown)."""
+    return dict(_COMMAND_STATE.get(command.strip().lower(), {}))
+
+
+def decode_notification(data: bytes | bytearray) -> DecodedFrame:
+    """Decode a notify payload into command echoes and state changes.
+
+    One payload may carry several frames; later frames win.
+    """
+    decoded = DecodedFrame()
+    text = bytes(data).decode("ascii", errors="ignore")
+
+    for frame in _SPLIT_RE.split(text):
+        frame = frame.strip().lower()
+        if not frame:
+            continue
+        if _COMMAND_RE.match(frame):
+            decoded.commands.append(frame)
+            decoded.state.update(_COMMAND_STATE.get(frame, {}))
+        elif frame.startswith(FRAME_STATUS_PREFIX):
+            decoded.state.update(_decode_status(frame[len(FRAME_STATUS_PREFIX):]))
+        else:
+            _LOGGER.debug("Unknown frame %r", frame)
+
+    return decoded
@@ -0,0 +1,160 @@
+"""Diagnostic sensors for the PT Baby Swing connection."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+from .coordinator import PTBabyCoordinator
+from .entity import PTBabyEntity
+from .metrics import (
+    METRIC_COMMAND,
+    METRIC_CONNECT,
+    METRIC_LOCK_WAIT,
+    METRIC_LOOKUP,
+    METRIC_STOP,
+    METRIC_WAKE,
+    METRIC_WRITE,
+    METRIC_WRITE_RETRY,
+)
+
+# Гістограма -> назва сенсора
+LATENCY_SENSORS = {
+    METRIC_COMMAND: "Затримка команди",
+    METRIC_STOP: "Затримка вимкнення",
+    METRIC_CONNECT: "Час підключення",
+    METRIC_LOOKUP: "Пошук пристрою",
+    METRIC_WAKE: "Час пробудження",
+    METRIC_WRITE: "Час запису",
+    METRIC_WRITE_RETRY: "Повтор запису",
+    METRIC_LOCK_WAIT: "Очікування лінку",
+}
+
+# Лічильник -> (назва, значення)
+COUNTER_SENSORS: dict[str, tuple[str, Callable[[PTBabyCoordinator], int]]] = {
+    "reconnects": ("Перепідключення", lambda c: c.connection_stats["reconnects"]),
+    "connect_failures": (
+        "Невдалі підключення",
+        lambda c: c.connection_stats["connect_failures"],
+    ),
+    "command_failures": ("Невдалі команди", lambda c: c.queue_stats["failed"]),
+    "wake_skips": ("Пропущені пробудження", lambda c: c.wake_stats["skips"]),
+    "lock_contention": ("Конкуренція за лінк", lambda c: c.queue_stats["lock_contention"]),
+    "noop_skipped": ("Пропущені зайві команди", lambda c: c.queue_stats["noop_skipped"]),
+    "command_timeouts": (
+        "Прострочені команди",
+        lambda c: c.queue_stats["expired"] + c.queue_stats["timed_out"],
+    ),
+    "write_retries": ("Повтори запису", lambda c: c.connection_stats["write_retries"]),
+    "link_losses": ("Втрати лінку", lambda c: c.connection_stats["link_losses"]),
+}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the diagnostic sensors."""
+    coordinator: PTBabyCoordinator = hass.data[DOMAIN][entry.entry_id]
+    entities: list[SensorEntity] = [
+        PTBabyLatencySensor(coordinator, metric, name)
+        for metric, name in LATENCY_SENSORS.items()
+    ]
+    entities.extend(
+        PTBabyCounterSensor(coordinator, key, name, value_fn)
+        for key, (name, value_fn) in COUNTER_SENSORS.items()
+    )
+    entities.append(PTBabyCircuitSensor(coordinator))
+    async_add_entities(entities)
+
+
+class PTBabyDiagnosticSensor(PTBabyEntity, SensorEntity):
+    """Base for connection sensors: hidden until enabled by the user."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    @property
+    def available(self) -> bool:
+        """Metrics stay meaningful while the cradle is out of range."""
+        return self.coordinator.last_update_success
+
+
+class PTBabyLatencySensor(PTBabyDiagnosticSensor):
+    """Median of one latency histogram; other quantiles as attributes."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, coordinator: PTBabyCoordinator, metric: str, name: str) -> None:
+        super().__init__(coordinator)
+        self._histogram = coordinator.metrics.histograms[metric]
+        self._attr_unique_id = f"{coordinator.address}_latency_{metric}"
+        self._attr_name = name
+        self._attr_translation_key = f"latency_{metric}"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self) -> float | None:
+        value = self._histogram.quantile(0.5)
+        return None if value is None else round(value * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self._histogram.as_dict()
+        return {key: stats[key] for key in ("count", "p95_ms", "p99_ms", "max_ms")}
+
+
+class PTBabyCounterSensor(PTBabyDiagnosticSensor):
+    """Monotonic connection counter."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self,
+        coordinator: PTBabyCoordinator,
+        key: str,
+        name: str,
+        value_fn: Callable[[PTBabyCoordinator], int],
+    ) -> None:
+        super().__init__(coordinator)
+        self._value_fn = value_fn
+        self._attr_unique_id = f"{coordinator.address}_{key}"
+        self._attr_name = name
+        self._attr_translation_key = key
+        self._attr_icon = "mdi:counter"
+
+    @property
+    def native_value(self) -> int:
+        return self._value_fn(self.coordinator)
+
+
+class PTBabyCircuitSensor(PTBabyDiagnosticSensor):
+    """State of the connection circuit breaker."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN]
+
+    def __init__(self, coordinator: PTBabyCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.address}_circuit"
+        self._attr_name = "Стан з'єднання"
+        self._attr_translation_key = "circuit"
+        self._attr_icon = "mdi:connection"
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.breaker.state
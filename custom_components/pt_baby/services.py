@@ -0,0 +1,219 @@
+"""Services for PT Baby Swing."""
+from __future__ import annotations
+
+import logging
+from time import monotonic
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    DOMAIN,
+    SERVICE_RUN_SEQUENCE,
+    SERVICE_BROADCAST,
+    ATTR_STEPS,
+    ATTR_ACTION,
+    ATTR_VALUE,
+    ATTR_DELAY,
+    ATTR_TIMEOUT,
+    MAX_COMMAND_TIMEOUT,
+    SEQUENCE_ACTIONS,
+    SEQUENCE_MAX_DELAY,
+    SERVICE_EXPORT_TRACE,
+    ATTR_CLEAR,
+    TRACE_FILE,
+    SERVICE_START_EMULATOR,
+    SERVICE_STOP_EMULATOR,
+    ATTR_COUNT,
+    ATTR_CONNECT_LATENCY,
+    ATTR_WRITE_LATENCY,
+    ATTR_LOSS,
+    ATTR_SLEEP_AFTER,
+    DATA_EMULATOR,
+    EMULATOR_CONNECT_LATENCY,
+    EMULATOR_WRITE_LATENCY,
+    EMULATOR_SLEEP_AFTER,
+    EMULATOR_MAX_DEVICES,
+)
+from .broadcast import async_broadcast, async_loaded_coordinators
+from .coordinator import PTBabyCoordinator
+from .emulator import EmulatorProfile, PTBabyEmulator
+
+_LOGGER = logging.getLogger(__name__)
+
+STEP_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ACTION): vol.In(SEQUENCE_ACTIONS),
+        vol.Optional(ATTR_VALUE): vol.Any(vol.Coerce(int), cv.boolean, cv.string),
+        vol.Optional(ATTR_DELAY, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=SEQUENCE_MAX_DELAY)
+        ),
+    }
+)
+
+RUN_SEQUENCE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, vol.Length(min=1), [STEP_SCHEMA]),
+        vol.Optional(ATTR_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_COMMAND_TIMEOUT)
+        ),
+    }
+)
+
+BROADCAST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, vol.Length(min=1), [STEP_SCHEMA]),
+        vol.Optional(ATTR_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=MAX_COMMAND_TIMEOUT)
+        ),
+    }
+)
+
+EXPORT_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
+START_EMULATOR_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_COUNT, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=EMULATOR_MAX_DEVICES)
+        ),
+        vol.Optional(ATTR_CONNECT_LATENCY, default=EMULATOR_CONNECT_LATENCY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=30)
+        ),
+        vol.Optional(ATTR_WRITE_LATENCY, default=EMULATOR_WRITE_LATENCY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=5)
+        ),
+        vol.Optional(ATTR_LOSS, default=0): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+        vol.Optional(ATTR_SLEEP_AFTER, default=EMULATOR_SLEEP_AFTER): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant, device_id: str) -> PTBabyCoordinator:
+    """Find the coordinator that owns a device."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device:
+        for entry_id in device.config_entries:
+            coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+            if isinstance(coordinator, PTBabyCoordinator):
+                return coordinator
+    raise HomeAssistantError(f"Device {device_id} is not a loaded PT Baby Swing")
+
+
+def _write_file(path: str, content: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(content)
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+
+    async def _async_run_sequence(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        started = monotonic()
+        try:
+            steps = await coordinator.async_run_sequence(
+                call.data[ATTR_STEPS], call.data.get(ATTR_TIMEOUT)
+            )
+        except ValueError as err:
+            raise HomeAssistantError(f"Invalid sequence: {err}") from err
+        except UpdateFailed as err:
+            raise HomeAssistantError(str(err)) from err
+        return {"total": round(monotonic() - started, 4), "steps": steps}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RUN_SEQUENCE,
+        _async_run_sequence,
+        schema=RUN_SEQUENCE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_broadcast(call: ServiceCall) -> ServiceResponse:
+        if ATTR_DEVICE_ID in call.data:
+            coordinators = [
+                _get_coordinator(hass, device_id) for device_id in call.data[ATTR_DEVICE_ID]
+            ]
+        else:
+            coordinators = async_loaded_coordinators(hass)
+        if not coordinators:
+            raise HomeAssistantError("No PT Baby Swing is loaded")
+        return await async_broadcast(
+            hass, coordinators, call.data[ATTR_STEPS], call.data.get(ATTR_TIMEOUT)
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BROADCAST,
+        _async_broadcast,
+        schema=BROADCAST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_export_trace(call: ServiceCall) -> ServiceResponse:
+        coordinator = _get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        tracer = coordinator.tracer
+        if not tracer.enabled and not tracer.events():
+            raise HomeAssistantError("Tracing is disabled in the integration options")
+        path = hass.config.path(TRACE_FILE.format(coordinator.address.replace(":", "").lower()))
+        events = tracer.events()
+        await hass.async_add_executor_job(_write_file, path, tracer.as_jsonl())
+        if call.data[ATTR_CLEAR]:
+            tracer.clear()
+        return {"path": path, "events": len(events)}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_TRACE,
+        _async_export_trace,
+        schema=EXPORT_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _async_start_emulator(call: ServiceCall) -> ServiceResponse:
+        if emulator := hass.data.pop(DATA_EMULATOR, None):
+            await emulator.async_stop()
+        profile = EmulatorProfile(
+            connect_latency=call.data[ATTR_CONNECT_LATENCY],
+            write_latency=call.data[ATTR_WRITE_LATENCY],
+            loss=call.data[ATTR_LOSS],
+            sleep_after=call.data[ATTR_SLEEP_AFTER],
+        )
+        emulator = hass.data[DATA_EMULATOR] = PTBabyEmulator(
+            hass, call.data[ATTR_COUNT], profile
+        )
+        emulator.async_start()
+        return emulator.as_dict()
+
+    async def _async_stop_emulator(call: ServiceCall) -> ServiceResponse:
+        if not (emulator := hass.data.pop(DATA_EMULATOR, None)):
+            return {"devices": []}
+        await emulator.async_stop()
+        return emulator.as_dict()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_EMULATOR,
+        _async_start_emulator,
+        schema=START_EMULATOR_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_EMULATOR,
+        _async_stop_emulator,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
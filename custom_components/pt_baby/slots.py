@@ -0,0 +1,239 @@
+"""Connection slots shared by all PT Baby Swing entries on one adapter."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import CONNECTION_SLOTS, DATA_SLOTS, DOMAIN, SLOT_IDLE_AFTER, SLOT_QUANTUM
+
+if TYPE_CHECKING:
+    from .coordinator import PTBabyCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Джерело для пристроїв, знайдених без інформації про адаптер
+UNKNOWN_SOURCE = "unknown"
+
+
+@dataclass
+class _SlotHolder:
+    owner: PTBabyCoordinator
+    granted_at: float
+    last_used: float
+    evicting: bool = False
+
+    @property
+    def evictable_at(self) -> float:
+        return min(self.last_used + SLOT_IDLE_AFTER, self.granted_at + SLOT_QUANTUM)
+
+
+@dataclass
+class _SourceSlots:
+    """Holders and FIFO waiters of one adapter or proxy."""
+
+    holders: dict[str, _SlotHolder] = field(default_factory=dict)
+    waiters: deque[tuple[PTBabyCoordinator, asyncio.Future[None]]] = field(
+        default_factory=deque
+    )
+    acquired: int = 0
+    waited: int = 0
+    evictions: int = 0
+    max_wait: float = 0.0
+    cancel_recheck: CALLBACK_TYPE | None = None
+
+
+class PTBabySlotScheduler:
+    """Caps concurrent connections per adapter across all cradles.
+
+    Waiters are served first come, first served. When an adapter is full,
+    the least recently used holder that is not sending and has been idle
+    for SLOT_IDLE_AFTER (or has had its slot for SLOT_QUANTUM) gets
+    disconnected to make room, so busy cradles take turns without paying
+    a reconnect for every command.
+    """
+
+    def __init__(self, hass: HomeAssistant, limit: int = CONNECTION_SLOTS) -> None:
+        self.hass = hass
+        self.limit = limit
+        self._sources: dict[str, _SourceSlots] = {}
+
+    def _slots(self, source: str | None) -> _SourceSlots:
+        return self._sources.setdefault(source or UNKNOWN_SOURCE, _SourceSlots())
+
+    async def async_acquire(self, source: str | None, owner: PTBabyCoordinator) -> float:
+        """Wait for a slot on ``source``; return how long the wait took."""
+        slots = self._slots(source)
+        if holder := slots.holders.get(owner.address):
+            holder.last_used = monotonic()
+            return 0.0
+        if len(slots.holders) < self.limit and not slots.waiters:
+            self._grant(slots, owner)
+            return 0.0
+
+        started = monotonic()
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        slots.waiters.append((owner, future))
+        slots.waited += 1
+        self._evict_idle(slots)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if (owner, future) in slots.waiters:
+                slots.waiters.remove((owner, future))
+            elif future.done() and not future.cancelled():
+                # Слот передали саме в момент скасування: повертаємо його
+                self.release(source, owner)
+            raise
+        waited = monotonic() - started
+        slots.max_wait = max(slots.max_wait, waited)
+        return waited
+
+    @callback
+    def claim(self, source: str | None, owner: PTBabyCoordinator) -> None:
+        """Account for a connection that already exists, even over the limit."""
+        slots = self._slots(source)
+        if owner.address not in slots.holders:
+            self._grant(slots, owner)
+
+    @callback
+    def move(self, source: str | None, new_source: str | None, owner: PTBabyCoordinator) -> None:
+        """Re-key the slot of ``owner`` once its connection's real source is known.
+
+        The connection already exists, so it is claimed on ``new_source``
+        even over the limit; the slot on ``source`` goes to the next waiter.
+        """
+        if (source or UNKNOWN_SOURCE) == (new_source or UNKNOWN_SOURCE):
+            return
+        self.claim(new_source, owner)
+        self.release(source, owner)
+
+    @callback
+    def _grant(self, slots: _SourceSlots, owner: PTBabyCoordinator) -> None:
+        now = monotonic()
+        slots.holders[owner.address] = _SlotHolder(owner, now, now)
+        slots.acquired += 1
+
+    @callback
+    def release(self, source: str | None, owner: PTBabyCoordinator) -> None:
+        """Free the slot of ``owner`` and hand it to the next waiter."""
+        slots = self._slots(source)
+        holder = slots.holders.get(owner.address)
+        if holder is None or holder.owner is not owner:
+            return
+        del slots.holders[owner.address]
+        while slots.waiters and len(slots.holders) < self.limit:
+            waiter, future = slots.waiters.popleft()
+            if future.done():
+                continue
+            self._grant(slots, waiter)
+            future.set_result(None)
+        if not slots.waiters and slots.cancel_recheck:
+            slots.cancel_recheck()
+            slots.cancel_recheck = None
+
+    @callback
+    def async_idle(self, source: str | None, owner: PTBabyCoordinator) -> None:
+        """Note that ``owner`` finished a command; yield the slot if others wait."""
+        slots = self._slots(source)
+        if holder := slots.holders.get(owner.address):
+            holder.last_used = monotonic()
+        if slots.waiters:
+            self._evict_idle(slots)
+
+    @callback
+    def async_yield(self, source: str | None, owner: PTBabyCoordinator) -> None:
+        """Give up the slot of ``owner`` right away if another cradle waits.
+
+        Used when no follow-up command is expected, such as after a
+        broadcast, so waiters skip the SLOT_IDLE_AFTER grace period.
+        """
+        slots = self._slots(source)
+        holder = slots.holders.get(owner.address)
+        if holder is None or holder.evicting or owner.link_busy:
+            return
+        evicting = sum(holder.evicting for holder in slots.holders.values())
+        if evicting < len(slots.waiters):
+            self._evict(slots, holder)
+
+    @callback
+    def _evict_idle(self, slots: _SourceSlots) -> None:
+        """Disconnect the least recently used idle holder, if there is one."""
+        if slots.cancel_recheck:
+            slots.cancel_recheck()
+            slots.cancel_recheck = None
+        evicting = sum(holder.evicting for holder in slots.holders.values())
+        if evicting >= len(slots.waiters):
+            return
+        now = monotonic()
+        candidates = [
+            holder
+            for holder in slots.holders.values()
+            if not holder.evicting and not holder.owner.link_busy
+        ]
+        idle = [holder for holder in candidates if holder.evictable_at <= now]
+        if not idle:
+            if candidates:
+                # Перевіримо знову, коли перша колиска стане "простоюючою";
+                # зайняті самі покличуть async_idle після команди
+
+                @callback
+                def _recheck(_now: datetime) -> None:
+                    slots.cancel_recheck = None
+                    self._evict_idle(slots)
+
+                delay = min(holder.evictable_at for holder in candidates) - now
+                slots.cancel_recheck = async_call_later(self.hass, max(delay, 0.05), _recheck)
+            return
+        self._evict(slots, min(idle, key=lambda holder: holder.last_used))
+
+    @callback
+    def _evict(self, slots: _SourceSlots, victim: _SlotHolder) -> None:
+        victim.evicting = True
+        slots.evictions += 1
+        _LOGGER.debug("Evicting idle connection to %s for a waiting cradle", victim.owner.address)
+        victim.owner.entry.async_create_background_task(
+            self.hass,
+            victim.owner.async_evict_slot(),
+            f"{DOMAIN}_evict_{victim.owner.address}",
+        )
+
+    def as_dict(self, owner: PTBabyCoordinator) -> dict[str, Any]:
+        """Slot usage as seen by ``owner``; other cradles stay anonymous."""
+        now = monotonic()
+        return {
+            "limit": self.limit,
+            "sources": {
+                source: {
+                    "holders": [
+                        {
+                            "self": holder.owner is owner,
+                            "idle_for": round(now - holder.last_used, 1),
+                            "evicting": holder.evicting,
+                        }
+                        for holder in slots.holders.values()
+                    ],
+                    "waiting": [waiter is owner for waiter, _future in slots.waiters],
+                    "acquired": slots.acquired,
+                    "waited": slots.waited,
+                    "evictions": slots.evictions,
+                    "max_wait": round(slots.max_wait, 3),
+                }
+                for source, slots in self._sources.items()
+            },
+        }
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PTBabySlotScheduler:
+    """Return the scheduler shared by every entry of the integration."""
+    if (scheduler := hass.data.get(DATA_SLOTS)) is None:
+        scheduler = hass.data[DATA_SLOTS] = PTBabySlotScheduler(hass)
+    return scheduler
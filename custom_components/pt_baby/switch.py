@@ -30,6 +30,8 @@ async def async_setup_entry(
 class PTBabyPowerSwitch(PTBabyEntity, SwitchEntity):
     """Representation of Baby Cradle power switch."""
 
+    _state_keys = ("is_on",)
+
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the switch."""
         super().__init__(coordinator)
@@ -53,6 +55,8 @@ class PTBabyPowerSwitch(PTBabyEntity, SwitchEntity):
 class PTBabyInductionSwitch(PTBabyEntity, SwitchEntity):
     """Representation of Baby Cradle induction mode switch."""
 
+    _state_keys = ("induction_mode",)
+
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         """Initialize the switch."""
         super().__init__(coordinator)
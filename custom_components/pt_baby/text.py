@@ -25,6 +25,9 @@ async def async_setup_entry(
 class PTBabyDebugInput(PTBabyEntity, TextEntity):
     """Allows sending raw commands to the swing."""
 
+    # Значення поля не залежить від стану колиски
+    _state_keys = ()
+
     def __init__(self, coordinator: PTBabyCoordinator) -> None:
         super().__init__(coordinator)
         self._attr_name = "Команда"
@@ -44,7 +47,8 @@ class PTBabyDebugInput(PTBabyEntity, TextEntity):
 
         # Використовуємо метод координатора замість створення нового підключення
         try:
-            await self.coordinator.async_send_command(command)
+            # Ручна команда надсилається завжди, навіть якщо стан уже такий
+            await self.coordinator.async_send_command(command, force=True)
         except Exception as e:
              _LOGGER.error("Failed to send command via coordinator: %s", e)
 
@@ -0,0 +1,104 @@
+"""Opt-in span tracer for the PT Baby command path."""
+from __future__ import annotations
+
+import itertools
+import json
+from collections import deque
+from contextlib import nullcontext
+from contextvars import ContextVar
+from time import monotonic, time
+from typing import Any
+
+from .const import TRACE_BUFFER_SIZE
+
+# Трасування, до якого належать спани поточної задачі
+_current_trace: ContextVar[int | None] = ContextVar("pt_baby_trace", default=None)
+
+_NOOP = nullcontext()
+
+
+class _Span:
+    """Times one phase and records it when the block exits."""
+
+    __slots__ = ("_tracer", "_name", "_trace", "_attrs", "_started")
+
+    def __init__(
+        self, tracer: PTBabyTracer, name: str, trace: int | None, attrs: dict[str, Any]
+    ) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._trace = trace
+        self._attrs = attrs
+
+    def __enter__(self) -> _Span:
+        self._started = monotonic()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        self._tracer.record(
+            self._name,
+            monotonic() - self._started,
+            trace=self._trace,
+            error=repr(exc) if exc is not None else None,
+            **self._attrs,
+        )
+
+
+class PTBabyTracer:
+    """Bounded ring buffer of span events, one trace per queued job.
+
+    Disabled tracers hand out a shared no-op context manager, so the
+    instrumented code pays only for a bool check.
+    """
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE) -> None:
+        self.enabled = False
+        self._events: deque[dict[str, Any]] = deque(maxlen=size)
+        self._trace_ids = itertools.count(1)
+
+    def new_trace(self) -> int | None:
+        return next(self._trace_ids) if self.enabled else None
+
+    @staticmethod
+    def activate(trace: int | None) -> None:
+        """Make ``trace`` the parent of spans opened by the current task."""
+        _current_trace.set(trace)
+
+    def span(self, name: str, **attrs: Any) -> _Span | nullcontext[None]:
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, _current_trace.get(), attrs)
+
+    def record(
+        self,
+        name: str,
+        duration: float | None = None,
+        *,
+        trace: int | None = None,
+        error: str | None = None,
+        **attrs: Any,
+    ) -> None:
+        """Append a span that just ended, or a point event without duration."""
+        if not self.enabled:
+            return
+        event: dict[str, Any] = {
+            "trace": trace if trace is not None else _current_trace.get(),
+            "span": name,
+            "ts": round(time() - (duration or 0.0), 4),
+        }
+        if duration is not None:
+            event["duration_ms"] = round(duration * 1000, 2)
+        if attrs:
+            event["attrs"] = attrs
+        if error:
+            event["error"] = error
+        self._events.append(event)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def events(self) -> list[dict[str, Any]]:
+        return list(self._events)
+
+    def as_jsonl(self) -> str:
+        return "".join(f"{json.dumps(event)}\n" for event in self._events)